@@ -10,14 +10,17 @@ bl_info = {
 
 from . import settings
 from . import operators
+from . import export_core
 from . import ui
 
 def register():
     settings.register()
     operators.register()
+    export_core.register()
     ui.register()
 
 def unregister():
     ui.unregister()
+    export_core.unregister()
     operators.unregister()
     settings.unregister()
\ No newline at end of file
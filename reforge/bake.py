@@ -1,20 +1,132 @@
 # reforge/bake.py
 import bpy
 import os
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    # Not bundled with Blender; used for solid PNGs when the user has it installed
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
 
 
 # ---------------------------
-# Helpers
+# Cycles bake session
 # ---------------------------
 
-def _ensure_cycles_engine(scene: bpy.types.Scene):
-    """Bake works through Cycles. Temporarily switch engine to CYCLES and return previous."""
-    prev_engine = scene.render.engine
-    if prev_engine != "CYCLES":
-        scene.render.engine = "CYCLES"
-    return prev_engine
+_GPU_BACKENDS = ("OPTIX", "CUDA", "HIP", "METAL", "ONEAPI")
+
+
+class _CyclesBakeSession:
+    """
+    Render settings for baking, applied once on the first bake and restored when the session closes.
+    Avoids switching the engine (and re-initializing Cycles) for every single bake.
+    """
+
+    def __init__(self, scene: bpy.types.Scene):
+        self.scene = scene
+        self.prev = None  # [(owner, attr, old_value)] once applied
+
+    def _set(self, owner, attr: str, value):
+        if owner is None or not hasattr(owner, attr):
+            return
+        try:
+            old = getattr(owner, attr)
+            if old != value:
+                setattr(owner, attr, value)
+                self.prev.append((owner, attr, old))
+        except Exception:
+            pass
+
+    def apply(self):
+        if self.prev is not None:
+            return
+        self.prev = []
+        scene = self.scene
+
+        # Bake works through Cycles
+        self._set(scene.render, "engine", "CYCLES")
+
+        # EMIT / DIFFUSE color bakes are deterministic: one sample, no denoise
+        cycles = getattr(scene, "cycles", None)
+        self._set(cycles, "samples", 1)
+        self._set(cycles, "use_denoising", False)
+        self._set(cycles, "tile_size", 256)
+
+        # Use GPU compute when any GPU backend is available (Cycles silently stays on CPU otherwise)
+        if self._enable_gpu_devices():
+            self._set(cycles, "device", "GPU")
+
+        # DIFFUSE fallback bakes COLOR only (ignored by EMIT)
+        b = scene.render.bake
+        self._set(b, "use_pass_direct", False)
+        self._set(b, "use_pass_indirect", False)
+        self._set(b, "use_pass_color", True)
+
+    def _enable_gpu_devices(self) -> bool:
+        """Pick a GPU backend in Cycles preferences and enable its devices. Changes are restored with the session."""
+        try:
+            cprefs = bpy.context.preferences.addons["cycles"].preferences
+        except (KeyError, AttributeError):
+            return False
+
+        current = getattr(cprefs, "compute_device_type", "NONE")
+        backends = [current] if current != "NONE" else []
+        backends += [b for b in _GPU_BACKENDS if b != current]
+
+        for backend in backends:
+            self._set(cprefs, "compute_device_type", backend)
+            if getattr(cprefs, "compute_device_type", None) != backend:
+                continue  # backend not supported by this build
+            try:
+                gpus = [d for d in cprefs.get_devices_for_type(backend) if d.type == backend]
+            except Exception:
+                continue
+            if gpus:
+                for d in gpus:
+                    self._set(d, "use", True)
+                return True
+        return False
+
+    def restore(self):
+        if self.prev is None:
+            return
+        for owner, attr, old in reversed(self.prev):
+            try:
+                setattr(owner, attr, old)
+            except Exception:
+                pass
+        self.prev = None
+
+
+_active_session = None
 
 
+@contextmanager
+def cycles_bake_session(scene: bpy.types.Scene):
+    """
+    Keep Cycles bake settings applied across all bakes inside the block.
+    Re-entrant: nested sessions reuse the outer one. Settings are only touched if a bake actually runs.
+    """
+    global _active_session
+    if _active_session is not None:
+        yield _active_session
+        return
+
+    _active_session = _CyclesBakeSession(scene)
+    try:
+        yield _active_session
+    finally:
+        session, _active_session = _active_session, None
+        session.restore()
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+
 def _activate_first_uv(obj: bpy.types.Object) -> bool:
     """Ensure mesh has UVs and first UV is active (and render-active if available)."""
     uv_layers = getattr(obj.data, "uv_layers", None)
@@ -30,20 +142,32 @@ def _activate_first_uv(obj: bpy.types.Object) -> bool:
     return True
 
 
-def _set_active_object(context, obj: bpy.types.Object):
-    """Select only this object and set it active."""
-    bpy.ops.object.select_all(action='DESELECT')
-    obj.select_set(True)
-    context.view_layer.objects.active = obj
+def _bake(context, obj: bpy.types.Object, bake_type: str, padding: int):
+    """Run the bake operator on obj alone via a context override (no scene-wide selection changes)."""
+    with context.temp_override(
+        active_object=obj,
+        object=obj,
+        selected_objects=[obj],
+        selected_editable_objects=[obj],
+    ):
+        bpy.ops.object.bake(type=bake_type, margin=int(padding), use_clear=True)
 
 
-def _set_active_material_slot(obj: bpy.types.Object, mat: bpy.types.Material) -> bool:
-    """Make given material active on object material slots (important for baking)."""
-    mat_index = None
+def material_slot_lookup(obj: bpy.types.Object) -> dict:
+    """Map material pointer -> first slot index. Build once per object, reuse for every bake."""
+    lookup = {}
     for i, slot in enumerate(obj.material_slots):
-        if slot.material == mat:
-            mat_index = i
-            break
+        m = slot.material
+        if m is not None:
+            lookup.setdefault(m.as_pointer(), i)
+    return lookup
+
+
+def _set_active_material_slot(obj: bpy.types.Object, mat: bpy.types.Material, slot_lookup: dict = None) -> bool:
+    """Make given material active on object material slots (important for baking)."""
+    if slot_lookup is None:
+        slot_lookup = material_slot_lookup(obj)
+    mat_index = slot_lookup.get(mat.as_pointer())
     if mat_index is None:
         return False
     obj.active_material_index = mat_index
@@ -51,133 +175,108 @@ def _set_active_material_slot(obj: bpy.types.Object, mat: bpy.types.Material) ->
     return True
 
 
-def _find_output_node(nt: bpy.types.NodeTree):
-    for n in nt.nodes:
-        if n.type == "OUTPUT_MATERIAL":
-            return n
-    return None
-
-
-def _find_principled_node(nt: bpy.types.NodeTree):
+def _nodes_by_type(nt: bpy.types.NodeTree) -> dict:
+    """Single pass over the node tree: node.type -> first node of that type."""
+    result = {}
     for n in nt.nodes:
-        if n.type == "BSDF_PRINCIPLED":
-            return n
-    return None
+        result.setdefault(n.type, n)
+    return result
 
 
-def _first_link_source_socket(input_socket):
-    """Return from_socket of first link feeding this INPUT socket."""
-    try:
-        if input_socket and input_socket.is_linked and input_socket.links:
-            return input_socket.links[0].from_socket
-    except Exception:
-        pass
-    return None
+_COLOR_SOURCE_TYPES = {"TEX_IMAGE", "RGB", "VERTEX_COLOR", "ATTRIBUTE"}
 
 
 def _walk_upstream_find_color_source(from_socket, max_nodes=250):
     """
     Try to find a good COLOR OUTPUT socket by walking upstream through node links.
+    Breadth-first, so the color source nearest to the output wins
+    (Image Texture is the ideal case; RGB / Vertex Color / Attribute also accepted).
     Returns an OUTPUT socket suitable to link into Emission Color, or None.
     """
-    if from_socket is None:
+    node0 = getattr(from_socket, "node", None) if from_socket is not None else None
+    if node0 is None:
         return None
 
-    stack = []
-    visited = set()
-
-    def push_node(node):
-        if node is None:
-            return
-        ptr = node.as_pointer()
-        if ptr in visited:
-            return
-        visited.add(ptr)
-        stack.append(node)
-
-    # seed from socket's node
-    node0 = getattr(from_socket, "node", None)
-    if node0 is not None:
-        push_node(node0)
+    # node names are unique within one tree: cheaper to hash than as_pointer()
+    queue = deque([node0])
+    visited = {node0.name}
 
     steps = 0
-    while stack and steps < max_nodes:
+    while queue and steps < max_nodes:
         steps += 1
-        node = stack.pop()
+        node = queue.popleft()
 
-        # Ideal: Image Texture
-        if node.type == "TEX_IMAGE":
-            out = node.outputs.get("Color") or (node.outputs[0] if node.outputs else None)
-            if out and getattr(out, "is_output", False):
-                return out
-
-        # Common color providers
-        if node.type in {"RGB", "VERTEX_COLOR", "ATTRIBUTE"}:
-            out = node.outputs.get("Color") or (node.outputs[0] if node.outputs else None)
-            if out and getattr(out, "is_output", False):
+        if node.type in _COLOR_SOURCE_TYPES:
+            outs = node.outputs
+            out = outs.get("Color") or (outs[0] if outs else None)
+            if out is not None:
                 return out
 
         # Walk linked inputs
-        for inp in getattr(node, "inputs", []):
-            src = _first_link_source_socket(inp)
-            if src is not None:
-                push_node(getattr(src, "node", None))
+        for inp in node.inputs:
+            if not inp.is_linked:
+                continue
+            links = inp.links
+            if not links:
+                continue
+            src = links[0].from_node
+            if src.name not in visited:
+                visited.add(src.name)
+                queue.append(src)
 
     return None
 
 
-def _setup_diffuse_color_bake(scene: bpy.types.Scene):
-    """
-    Configure Cycles bake settings to bake DIFFUSE COLOR only.
-    Returns previous values to restore.
-    """
-    b = scene.render.bake
-    prev = {
-        "use_pass_direct": getattr(b, "use_pass_direct", None),
-        "use_pass_indirect": getattr(b, "use_pass_indirect", None),
-        "use_pass_color": getattr(b, "use_pass_color", None),
-    }
-    try:
-        b.use_pass_direct = False
-        b.use_pass_indirect = False
-        b.use_pass_color = True
-    except Exception:
-        pass
-    return prev
+def _save_png(img: bpy.types.Image, out_abs_path: str):
+    """Save image datablock as PNG (Blender's default PNG compression)."""
+    img.filepath_raw = out_abs_path
+    img.file_format = "PNG"
+    img.save()
 
 
-def _restore_diffuse_color_bake(scene: bpy.types.Scene, prev: dict):
-    b = scene.render.bake
-    try:
-        if prev.get("use_pass_direct") is not None:
-            b.use_pass_direct = prev["use_pass_direct"]
-        if prev.get("use_pass_indirect") is not None:
-            b.use_pass_indirect = prev["use_pass_indirect"]
-        if prev.get("use_pass_color") is not None:
-            b.use_pass_color = prev["use_pass_color"]
-    except Exception:
-        pass
+def _linear_to_srgb(c: float) -> float:
+    # sRGB transfer function (what a bake applies when writing a byte image)
+    c = min(max(float(c), 0.0), 1.0)
+    return c * 12.92 if c <= 0.0031308 else 1.055 * c ** (1.0 / 2.4) - 0.055
 
 
 def _save_solid_png(out_abs_path: str, rgba, size: int = 1) -> bool:
-    """Create and save a solid-color PNG (size x size)."""
+    """
+    Create and save a solid-color PNG (size x size).
+    rgba is a scene-linear color (e.g. a socket default_value); RGB is written as sRGB
+    like a bake would, alpha as is.
+    """
     os.makedirs(os.path.dirname(out_abs_path), exist_ok=True)
-
-    name = os.path.splitext(os.path.basename(out_abs_path))[0]
-    img = bpy.data.images.new(name, width=int(size), height=int(size), alpha=True, float_buffer=False)
-
+    size = int(size)
     r, g, b, a = rgba
-    pixels = [float(r), float(g), float(b), float(a)] * (int(size) * int(size))
-    img.pixels = pixels
+    rgba = (_linear_to_srgb(r), _linear_to_srgb(g), _linear_to_srgb(b), float(a))
 
-    img.filepath_raw = out_abs_path
-    img.file_format = "PNG"
-    img.save()
+    if PILImage is not None:
+        # Straight to disk: no Image datablock, no Blender PNG writer.
+        # Same float -> byte rounding as Blender's byte buffers.
+        rgba8 = tuple(int(min(max(float(c), 0.0), 1.0) * 255.0 + 0.5) for c in rgba)
+        PILImage.new("RGBA", (size, size), rgba8).save(out_abs_path, "PNG", compress_level=0)
+        return True
 
+    name = os.path.splitext(os.path.basename(out_abs_path))[0]
+    img = bpy.data.images.new(name, width=size, height=size, alpha=True, float_buffer=False)
     try:
-        bpy.data.images.remove(img)
-    except Exception:
-        pass
+        r, g, b, a = rgba
+        n = size * size
+        if n == 1:
+            img.pixels = (float(r), float(g), float(b), float(a))
+        else:
+            # Fill through a NumPy view and bulk-upload: avoids boxing every float into a Python list
+            buf = np.empty(n * 4, dtype=np.float32)
+            buf.reshape(n, 4)[:] = (r, g, b, a)
+            img.pixels.foreach_set(buf)
+
+        _save_png(img, out_abs_path)
+    finally:
+        try:
+            bpy.data.images.remove(img)
+        except Exception:
+            pass
 
     return True
 
@@ -192,18 +291,23 @@ def bake_color_emit_png(
     out_abs_path: str,
     resolution: int,
     padding: int,
+    slot_lookup: dict = None,
+    force_solid_when_constant: bool = True,
 ) -> bool:
     """
     Bake FINAL COLOR to PNG.
 
     Strategy:
-      0) If there are NO UVs and we can detect a constant Base Color -> write 1x1 PNG and return.
+      0) If we can detect a constant Base Color (always when force_solid_when_constant,
+         otherwise only when there are NO UVs) -> write 1x1 PNG and return, no Cycles bake.
       1) Try EMIT override (best for Ucupaint / layered graphs):
           - Feed Emission Color from:
               a) Principled Base Color source (link source socket), or constant Base Color
               b) Else: walk upstream from Material Output Surface shader and try to find an Image Texture / RGB / Vertex Color
       2) If EMIT override cannot find a reasonable color input, fallback to DIFFUSE bake with COLOR-only pass.
 
+    slot_lookup: optional result of material_slot_lookup(obj), shared across bakes of one object.
+
     Returns True on success.
     """
     if not obj or obj.type != "MESH":
@@ -213,9 +317,10 @@ def bake_color_emit_png(
         print("[Reforge][Bake] Material missing or does not use nodes")
         return False
 
-    # Try to detect constant base color early (for no-UV fallback)
+    # Try to detect constant base color early (solid PNG shortcut)
     nt = mat.node_tree
-    principled = _find_principled_node(nt)
+    nodes_by_type = _nodes_by_type(nt)
+    principled = nodes_by_type.get("BSDF_PRINCIPLED")
     early_constant_rgba = None
     if principled is not None:
         bc = principled.inputs.get("Base Color") or principled.inputs.get("Color")
@@ -229,9 +334,10 @@ def bake_color_emit_png(
     uv_layers = getattr(obj.data, "uv_layers", None)
     has_uv = bool(uv_layers and len(uv_layers) > 0)
 
-    # If no UVs but we have constant color -> 1x1 PNG fallback
-    if not has_uv and early_constant_rgba is not None:
-        print("[Reforge][Bake] No UVs: saving solid 1x1 PNG instead of baking.")
+    # Constant color -> 1x1 PNG; a full bake would only produce a uniform texture
+    if early_constant_rgba is not None and (force_solid_when_constant or not has_uv):
+        reason = "Constant Base Color" if has_uv else "No UVs"
+        print(f"[Reforge][Bake] {reason}: saving solid 1x1 PNG instead of baking.")
         return _save_solid_png(out_abs_path, early_constant_rgba, size=1)
 
     # If we want to bake but no UVs and no constant -> cannot bake
@@ -248,16 +354,10 @@ def bake_color_emit_png(
 
     ctx = bpy.context
     scene = ctx.scene
-    prev_engine = _ensure_cycles_engine(scene)
 
-    # Ensure correct active object/material
-    _set_active_object(ctx, obj)
-    if not _set_active_material_slot(obj, mat):
+    # Ensure correct active material (object selection is overridden at bake time)
+    if not _set_active_material_slot(obj, mat, slot_lookup):
         print(f"[Reforge][Bake] Material '{mat.name}' not found in object slots")
-        try:
-            scene.render.engine = prev_engine
-        except Exception:
-            pass
         return False
 
     # Create image datablock (target)
@@ -273,7 +373,7 @@ def bake_color_emit_png(
     nodes = nt.nodes
     links = nt.links
 
-    out_node = _find_output_node(nt)
+    out_node = nodes_by_type.get("OUTPUT_MATERIAL")
     if out_node is None:
         out_node = nodes.new("ShaderNodeOutputMaterial")
         out_node.location = (500, 0)
@@ -285,10 +385,6 @@ def bake_color_emit_png(
             bpy.data.images.remove(img)
         except Exception:
             pass
-        try:
-            scene.render.engine = prev_engine
-        except Exception:
-            pass
         return False
 
     # Save original surface links as socket pairs (robust restore)
@@ -363,23 +459,20 @@ def bake_color_emit_png(
         pass
 
     ok = False
-    prev_bake = None
 
     try:
-        if can_emit:
-            print(f"[Reforge][Bake] EMIT bake: obj='{obj.name}', mat='{mat.name}', res={resolution}, pad={padding}")
-            bpy.ops.object.bake(type='EMIT', margin=int(padding), use_clear=True)
-            ok = True
-        else:
-            prev_bake = _setup_diffuse_color_bake(scene)
-            print(f"[Reforge][Bake] DIFFUSE(COLOR) fallback: obj='{obj.name}', mat='{mat.name}', res={resolution}, pad={padding}")
-            bpy.ops.object.bake(type='DIFFUSE', margin=int(padding), use_clear=True)
+        with cycles_bake_session(scene) as session:
+            session.apply()
+            if can_emit:
+                print(f"[Reforge][Bake] EMIT bake: obj='{obj.name}', mat='{mat.name}', res={resolution}, pad={padding}")
+                _bake(ctx, obj, 'EMIT', padding)
+            else:
+                print(f"[Reforge][Bake] DIFFUSE(COLOR) fallback: obj='{obj.name}', mat='{mat.name}', res={resolution}, pad={padding}")
+                _bake(ctx, obj, 'DIFFUSE', padding)
             ok = True
 
         if ok:
-            img.filepath_raw = out_abs_path
-            img.file_format = "PNG"
-            img.save()
+            _save_png(img, out_abs_path)
             print(f"[Reforge][Bake] Saved: {out_abs_path}")
 
     except Exception as e:
@@ -387,10 +480,6 @@ def bake_color_emit_png(
         ok = False
 
     finally:
-        # Restore bake settings if changed
-        if prev_bake is not None:
-            _restore_diffuse_color_bake(scene, prev_bake)
-
         # Restore Surface links
         try:
             for l in list(surface_input.links):
@@ -411,12 +500,6 @@ def bake_color_emit_png(
             except Exception:
                 pass
 
-        # Restore render engine
-        try:
-            scene.render.engine = prev_engine
-        except Exception:
-            pass
-
         # Remove temp image datablock (file already saved)
         try:
             bpy.data.images.remove(img)
@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import numpy as np
 from mathutils import Matrix
 
 AXIS_CONVERT = Matrix((
@@ -8,6 +9,7 @@ AXIS_CONVERT = Matrix((
     (0, -1, 0, 0),
     (0, 0, 0, 1),
 ))
+AXIS_CONVERT_3X3 = AXIS_CONVERT.to_3x3()
 
 DEFAULT_COLLISION_FRICTION = 0.1
 DEFAULT_COLLISION_RESTITUTION = 0.5
@@ -17,6 +19,7 @@ def export_convex_hull_points(obj: bpy.types.Object, filepath: str) -> None:
     obj_eval = obj.evaluated_get(depsgraph)
 
     mesh = None
+    hull_mesh = None
     try:
         mesh = obj_eval.to_mesh()
         bm = bmesh.new()
@@ -28,20 +31,24 @@ def export_convex_hull_points(obj: bpy.types.Object, filepath: str) -> None:
 
         bmesh.ops.convex_hull(bm, input=bm.verts)
 
-        rs = obj.matrix_world.to_3x3()
-        axis_rs = AXIS_CONVERT.to_3x3()
+        # bmesh has no bulk accessor: round-trip through a temp mesh to read all coords at once
+        hull_mesh = bpy.data.meshes.new("_reforge_hull_tmp")
+        bm.to_mesh(hull_mesh)
+        bm.free()
 
-        with open(filepath, "w", encoding="utf-8", newline="\n") as f:
-            f.write("shape_type: TYPE_HULL\n")
-            for v in bm.verts:
-                p = rs @ v.co
-                p = axis_rs @ p
-                f.write(f"data: {p.x}\n")
-                f.write(f"data: {p.y}\n")
-                f.write(f"data: {p.z}\n")
+        co = np.empty(len(hull_mesh.vertices) * 3, dtype=np.float32)
+        hull_mesh.vertices.foreach_get("co", co)
 
-        bm.free()
+        m = np.asarray(AXIS_CONVERT_3X3 @ obj.matrix_world.to_3x3(), dtype=np.float64)
+        p = co.reshape(-1, 3) @ m.T
+
+        # One pre-joined payload, one write (np.savetxt would still write row by row)
+        body = "".join(["data: %.7g\n" % v for v in p.ravel().tolist()])
+        with open(filepath, "w", buffering=1 << 20, encoding="utf-8", newline="\n") as f:
+            f.write("shape_type: TYPE_HULL\n" + body)
     finally:
+        if hull_mesh is not None:
+            bpy.data.meshes.remove(hull_mesh)
         if mesh is not None:
             obj_eval.to_mesh_clear()
 
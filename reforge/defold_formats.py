@@ -1,3 +1,4 @@
+import io
 from typing import List, Tuple, Optional
 
 def make_model_text_multi(mesh_path_project: str, model_name: str, materials_blocks: List[Tuple[str, str, str]]) -> str:
@@ -35,8 +36,21 @@ components {{
 }}
 '''
 
-def make_collection_text_grouped_embedded(collection_name: str, protos_sorted: list, instances_by_proto: dict) -> str:
-    parts = [f'name: "{collection_name}"\n']
+# .collection fragments: module-level so every instance reuses the same string objects
+_INSTANCE_OPEN = 'instances {\n  id: "%s"\n  prototype: "%s"\n'
+_POS_TMPL = "  position {\n    x: %.6f\n    y: %.6f\n    z: %.6f\n  }\n"
+_ROT_TMPL = "  rotation {\n    x: %.6f\n    y: %.6f\n    z: %.6f\n    w: %.6f\n  }\n"
+_SCALE_TMPL = "  scale3 {\n    x: %.6f\n    y: %.6f\n    z: %.6f\n  }\n"
+_CLOSE = "}\n"
+_SCALE_ALONG_Z = "scale_along_z: 0\n"
+_EMBEDDED_OPEN = 'embedded_instances {\n  id: "%s"\n'
+_EMBEDDED_CHILD = '  children: "%s"\n'
+_EMBEDDED_CLOSE = '  data: ""\n}\n'
+
+def write_collection_grouped_embedded(fh, collection_name: str, protos_sorted: list, instances_by_proto: dict):
+    """Stream the .collection text into fh (anything with .write) instead of building one big string."""
+    w = fh.write
+    w(f'name: "{collection_name}"\n')
 
     for proto in protos_sorted:
         for inst in instances_by_proto.get(proto, []):
@@ -44,49 +58,29 @@ def make_collection_text_grouped_embedded(collection_name: str, protos_sorted: l
             qx, qy, qz, qw = inst["quat"]
             sx, sy, sz = inst["scale"]
 
-            parts.append("instances {\n")
-            parts.append(f'  id: "{inst["id"]}"\n')
-            parts.append(f'  prototype: "{inst["prototype"]}"\n')
-
+            block = _INSTANCE_OPEN % (inst["id"], inst["prototype"])
             if abs(px) > 1e-9 or abs(py) > 1e-9 or abs(pz) > 1e-9:
-                parts.append("  position {\n")
-                parts.append(f"    x: {px:.6f}\n")
-                parts.append(f"    y: {py:.6f}\n")
-                parts.append(f"    z: {pz:.6f}\n")
-                parts.append("  }\n")
-
+                block += _POS_TMPL % (px, py, pz)
             if abs(qx) > 1e-9 or abs(qy) > 1e-9 or abs(qz) > 1e-9 or abs(qw - 1.0) > 1e-9:
-                parts.append("  rotation {\n")
-                parts.append(f"    x: {qx:.6f}\n")
-                parts.append(f"    y: {qy:.6f}\n")
-                parts.append(f"    z: {qz:.6f}\n")
-                parts.append(f"    w: {qw:.6f}\n")
-                parts.append("  }\n")
-
+                block += _ROT_TMPL % (qx, qy, qz, qw)
             if abs(sx - 1.0) > 1e-9 or abs(sy - 1.0) > 1e-9 or abs(sz - 1.0) > 1e-9:
-                parts.append("  scale3 {\n")
-                parts.append(f"    x: {sx:.6f}\n")
-                parts.append(f"    y: {sy:.6f}\n")
-                parts.append(f"    z: {sz:.6f}\n")
-                parts.append("  }\n")
-
-            parts.append("}\n")
+                block += _SCALE_TMPL % (sx, sy, sz)
+            w(block + _CLOSE)
 
-    parts.append("scale_along_z: 0\n")
+    w(_SCALE_ALONG_Z)
 
-    parts.append("embedded_instances {\n")
-    parts.append('  id: "root"\n')
+    w(_EMBEDDED_OPEN % "root")
     for proto in protos_sorted:
-        parts.append(f'  children: "{proto}"\n')
-    parts.append('  data: ""\n')
-    parts.append("}\n")
+        w(_EMBEDDED_CHILD % proto)
+    w(_EMBEDDED_CLOSE)
 
     for proto in protos_sorted:
-        parts.append("embedded_instances {\n")
-        parts.append(f'  id: "{proto}"\n')
+        w(_EMBEDDED_OPEN % proto)
         for inst in instances_by_proto.get(proto, []):
-            parts.append(f'  children: "{inst["id"]}"\n')
-        parts.append('  data: ""\n')
-        parts.append("}\n")
+            w(_EMBEDDED_CHILD % inst["id"])
+        w(_EMBEDDED_CLOSE)
 
-    return "".join(parts)
\ No newline at end of file
+def make_collection_text_grouped_embedded(collection_name: str, protos_sorted: list, instances_by_proto: dict) -> str:
+    buf = io.StringIO()
+    write_collection_grouped_embedded(buf, collection_name, protos_sorted, instances_by_proto)
+    return buf.getvalue()
\ No newline at end of file
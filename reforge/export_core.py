@@ -1,16 +1,26 @@
 # reforge/export_core.py
 import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import compress
+from types import SimpleNamespace
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
 from mathutils import Matrix
 
 from .utils import (
+    clear_dir_cache,
     ensure_dir,
     safe_remove_file,
     write_text_file,
     sanitize_id,
-    select_only,
     export_glb_selected,
     get_prop,
-    is_object_visible,
+    project_path,
+    copy_file_fast,
+    visible_mask,
 )
 
 from .materials import (
@@ -27,10 +37,29 @@ from .collision import (
 from .defold_formats import (
     make_model_text_multi,
     make_go_ref_model_text,
-    make_collection_text_grouped_embedded,
+    write_collection_grouped_embedded,
 )
 
-from .bake import bake_color_emit_png
+from .bake import bake_color_emit_png, cycles_bake_session, material_slot_lookup
+
+from .parallel import MIN_PARALLEL_PROTOTYPES, export_prototypes_parallel
+
+from .fingerprint import (
+    PROTOTYPE_DIGEST_EXT,
+    GLB_DIGEST_EXT,
+    OBJECT_DIGEST_KEYS,
+    MATERIAL_DIGEST_KEYS,
+    prototype_digest,
+    model_digest,
+    glb_digest,
+    image_file_stats,
+    read_digest,
+    write_digest,
+    mesh_digest,
+    bake_digest,
+    read_bake_cache,
+    write_bake_cache,
+)
 
 
 AXIS_CONVERT = Matrix((
@@ -39,6 +68,11 @@ AXIS_CONVERT = Matrix((
     (0, -1, 0, 0),
     (0, 0, 0, 1),
 ))
+# pure axis permutation (orthogonal): the inverse is the transpose, no solve needed
+AXIS_CONVERT_INV = AXIS_CONVERT.transposed()
+
+_AXIS_CONVERT_NP = np.array(AXIS_CONVERT, dtype=np.float64)
+_AXIS_CONVERT_INV_NP = np.array(AXIS_CONVERT_INV, dtype=np.float64)
 
 
 def has_defold_collision(obj) -> bool:
@@ -57,19 +91,68 @@ def get_collision_mask(obj) -> str:
     return v if v else "default"
 
 
-def to_defold_trs(obj):
+def _rotation_to_quat_batch(r):
+    """
+    (N,3,3) rotation matrices -> (N,4) quaternions as (x, y, z, w).
+    Branchless: every row uses the best-conditioned of the four standard solutions
+    (largest of 1+trace and the three 1+2*m_ii-trace), picked with argmax/choose.
+    """
+    m00, m01, m02 = r[:, 0, 0], r[:, 0, 1], r[:, 0, 2]
+    m10, m11, m12 = r[:, 1, 0], r[:, 1, 1], r[:, 1, 2]
+    m20, m21, m22 = r[:, 2, 0], r[:, 2, 1], r[:, 2, 2]
+
+    t = np.stack((
+        1.0 + m00 + m11 + m22,
+        1.0 + m00 - m11 - m22,
+        1.0 - m00 + m11 - m22,
+        1.0 - m00 - m11 + m22,
+    ), axis=1)
+    k = np.argmax(t, axis=1)
+    tk = t[np.arange(len(r)), k]  # the four sum to 4, so tk >= 1
+
+    # numerators of (x, y, z, w) for each case; all share the denominator 2*sqrt(tk)
+    q = np.choose(k[:, None], (
+        np.stack((m21 - m12, m02 - m20, m10 - m01, tk), axis=1),
+        np.stack((tk, m01 + m10, m02 + m20, m21 - m12), axis=1),
+        np.stack((m01 + m10, tk, m12 + m21, m02 - m20), axis=1),
+        np.stack((m02 + m20, m12 + m21, tk, m10 - m01), axis=1),
+    ))
+    q /= (2.0 * np.sqrt(tk))[:, None]
+
+    # canonical form (w >= 0), same as mathutils
+    q[q[:, 3] < 0.0] *= -1.0
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    return q
+
+
+def to_defold_trs_batch(objs) -> list:
     """
-    Convert Blender world transform to Defold-friendly TRS using axis conversion.
-    Returns:
-      pos (x,y,z), quat (x,y,z,w), scale (x,y,z)
+    Convert Blender world transforms to Defold-friendly TRS using axis conversion,
+    for many objects at once.
+    Returns list of (pos (x,y,z), quat (x,y,z,w), scale (x,y,z)) tuples in the same order as objs.
     """
-    mw = obj.matrix_world.copy()
-    c = AXIS_CONVERT
-    mw_def = c @ mw @ c.inverted()
-    loc = mw_def.to_translation()
-    rot = mw_def.to_quaternion()
-    scl = mw_def.to_scale()
-    return (loc.x, loc.y, loc.z), (rot.x, rot.y, rot.z, rot.w), (scl.x, scl.y, scl.z)
+    if not objs:
+        return []
+
+    # one preallocated (N,4,4) buffer, then a single contraction C @ M[n] @ Cinv for all n
+    mw = np.empty((len(objs), 4, 4), dtype=np.float64)
+    for i, o in enumerate(objs):
+        mw[i] = o.matrix_world
+    md = np.einsum("ij,njk,kl->nil", _AXIS_CONVERT_NP, mw, _AXIS_CONVERT_INV_NP, optimize=True)
+
+    loc = md[:, :3, 3]
+    rs = md[:, :3, :3]
+    scl = np.linalg.norm(rs, axis=1)
+
+    # normalize columns, flip negative-determinant matrices (mirrored) like mathutils does
+    rot = rs / np.where(scl > 0.0, scl, 1.0)[:, None, :]
+    rot[np.linalg.det(rot) < 0.0] *= -1.0
+    quat = _rotation_to_quat_batch(rot)
+
+    return [
+        (tuple(p), tuple(q), tuple(sc))
+        for p, q, sc in zip(loc.tolist(), quat.tolist(), scl.tolist())
+    ]
 
 
 def _make_baked_texture_filename(proto: str, mat_name: str) -> str:
@@ -92,7 +175,278 @@ def _material_prop_int(mat, key: str, default: int) -> int:
         return default
 
 
-def export_single_prototype_assets(context, obj) -> str:
+@dataclass
+class MatBakeCfg:
+    """Bake-related material props, read once per material before the export loop."""
+    bake: bool
+    res: int
+    pad: int
+    force_solid: bool
+
+
+def _mat_bake_cfg(mat) -> MatBakeCfg:
+    return MatBakeCfg(
+        bake=_material_prop_bool(mat, "bake_color_texture"),
+        res=_material_prop_int(mat, "bake_resolution", 1024),
+        pad=_material_prop_int(mat, "bake_padding", 8),
+        force_solid=_material_prop_bool(mat, "force_solid_when_constant", True),
+    )
+
+
+def _reuse_baked_texture(
+    baked_cache: dict, key: str, abs_textures: str, baked_filename: str, allow_hardlink: bool = False
+) -> bool:
+    """
+    Put the PNG previously baked for key in place of baked_filename (copied, or hardlinked
+    with allow_hardlink, i.e. the Hardlink Textures setting).
+    False on a miss, or when that PNG was since re-baked/edited (size/mtime no longer match).
+    """
+    entry = baked_cache.get(key)
+    if not entry:
+        return False
+    cached_filename, size, mtime_ns = entry
+    cached_abs = os.path.join(abs_textures, cached_filename)
+    try:
+        st = os.stat(cached_abs)
+    except OSError:
+        st = None
+    if st is None or st.st_size != size or st.st_mtime_ns != mtime_ns:
+        del baked_cache[key]
+        return False
+
+    if cached_filename != baked_filename:
+        copy_file_fast(cached_abs, os.path.join(abs_textures, baked_filename), allow_hardlink)
+    print(f"[Reforge] Reused baked texture: {cached_filename} -> {baked_filename}")
+    return True
+
+
+def _remember_baked_texture(baked_cache: dict, key: str, abs_textures: str, baked_filename: str):
+    try:
+        st = os.stat(os.path.join(abs_textures, baked_filename))
+    except OSError:
+        return
+    baked_cache[key] = [baked_filename, st.st_size, st.st_mtime_ns]
+
+
+def _project_dir(d: str) -> str:
+    # forward slashes, no leading/trailing "/": project_path() then needs no fixing ("/x" or "x/" alike)
+    return d.replace("\\", "/").strip("/")
+
+
+def export_paths(s) -> SimpleNamespace:
+    """
+    Absolute output dirs + project-relative dir prefixes, computed once per export batch.
+    Project dirs are normalized to forward slashes here so per-file paths need no fixing.
+    """
+    root = s.project_root
+    return SimpleNamespace(
+        abs_models=os.path.join(root, s.models_dir),
+        abs_prefabs=os.path.join(root, s.prefabs_dir),
+        abs_scenes=os.path.join(root, s.scenes_dir),
+        abs_textures=os.path.join(root, s.textures_dir),
+        abs_collisions=os.path.join(root, s.collisions_dir),
+        models=_project_dir(s.models_dir),
+        prefabs=_project_dir(s.prefabs_dir),
+        textures=_project_dir(s.textures_dir),
+        collisions=_project_dir(s.collisions_dir),
+    )
+
+
+# First line of every generated .model: model_digest of its inputs (protobuf text comment)
+_MODEL_KEY_PREFIX = "# reforge-model: "
+
+
+def _read_model_key(abs_model: str) -> str:
+    try:
+        with open(abs_model, "r", encoding="utf-8") as f:
+            line = f.readline()
+    except OSError:
+        return ""
+    return line[len(_MODEL_KEY_PREFIX):].strip() if line.startswith(_MODEL_KEY_PREFIX) else ""
+
+
+_MODEL_TEXTURE_PREFIX = 'texture: "'
+
+
+def _model_textures_exist(paths, abs_model: str, proto: str, export_textures: bool) -> bool:
+    """
+    True when every texture the exporter writes for this .model is still in the textures dir:
+    baked <proto>__*_albedo.png always, copied images when export_textures is on
+    (otherwise textures-dir paths are the user's own files, re-exporting can't restore them).
+    """
+    prefix = project_path(paths.textures, "")
+    try:
+        with open(abs_model, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return False
+    for line in lines:
+        line = line.strip()
+        if not line.startswith(_MODEL_TEXTURE_PREFIX):
+            continue
+        tex = line[len(_MODEL_TEXTURE_PREFIX):].rstrip('"')
+        if not tex.startswith(prefix):
+            continue
+        name = tex[len(prefix):]
+        baked = name.startswith(f"{proto}__") and name.endswith("_albedo.png")
+        if (baked or export_textures) and not os.path.isfile(os.path.join(paths.abs_textures, name)):
+            return False
+    return True
+
+
+def _prototype_files_exist(paths, obj, proto: str, export_textures: bool) -> bool:
+    files = [
+        os.path.join(paths.abs_models, f"{proto}.glb"),
+        os.path.join(paths.abs_models, f"{proto}.model"),
+        os.path.join(paths.abs_prefabs, f"{proto}.go"),
+    ]
+    if has_defold_collision(obj):
+        files.append(os.path.join(paths.abs_collisions, f"{proto}.convexshape"))
+        files.append(os.path.join(paths.abs_collisions, f"{proto}.collisionobject"))
+    if not all(os.path.isfile(f) for f in files):
+        return False
+    return _model_textures_exist(paths, files[1], proto, export_textures)
+
+
+def _prototype_up_to_date(paths, obj, proto: str, digest: str, export_textures: bool) -> bool:
+    """
+    True when the stored <proto>.reforge.hash equals digest and all generated files
+    (including the textures the .model points to) still exist.
+    """
+    if read_digest(os.path.join(paths.abs_models, f"{proto}{PROTOTYPE_DIGEST_EXT}")) != digest:
+        return False
+    return _prototype_files_exist(paths, obj, proto, export_textures)
+
+
+# ---------------------------
+# In-session export memo
+# ---------------------------
+
+# proto -> (memo key, pointers of the ID blocks it was exported from), for prototypes exported
+# in this Blender session. The depsgraph handler drops an entry as soon as one of those IDs
+# changes, so an unchanged prototype is skipped without even computing its content digest.
+_PROTO_EXPORT_CACHE = {}
+
+# Set while the exporter itself edits the scene (selection, temporary bake nodes, render settings)
+_ignore_depsgraph_updates = False
+
+# (scene, view layer, visible-only) -> (_prototype_tags, prototype groups) of the last scan;
+# any user edit drops it
+_GROUP_CACHE = {}
+
+# Shared by any number of materials: a change drops the whole memo
+_MEMO_GLOBAL_ID_TYPES = (bpy.types.NodeTree, bpy.types.Image)
+
+
+def _export_memo_key(s, obj, materials) -> tuple:
+    # ID property edits from Python don't tag the depsgraph, and image files edited on disk
+    # (not reloaded) notify nothing at all, so both are part of the key
+    return (
+        bpy.data.filepath,
+        obj.as_pointer(),
+        obj.name,
+        s.project_root, s.models_dir, s.prefabs_dir, s.textures_dir, s.collisions_dir,
+        s.default_material, bool(s.export_textures),
+        tuple((obj.get(k), obj.data.get(k)) for k in OBJECT_DIGEST_KEYS),
+        tuple((m.as_pointer(),) + tuple(m.get(k) for k in MATERIAL_DIGEST_KEYS) for m in materials),
+        image_file_stats(materials),
+    )
+
+
+def _export_memo_deps(obj, materials) -> frozenset:
+    return frozenset([obj.as_pointer(), obj.data.as_pointer()] + [m.as_pointer() for m in materials])
+
+
+@contextmanager
+def _exporter_updates(context):
+    """Keep the exporter's own scene edits from evicting memo entries (re-entrant)."""
+    global _ignore_depsgraph_updates
+    if _ignore_depsgraph_updates:
+        yield
+        return
+
+    # evaluate pending user edits first, so they still reach the handler
+    context.view_layer.update()
+    _ignore_depsgraph_updates = True
+    try:
+        yield
+    finally:
+        try:
+            # evaluate our own pending edits (e.g. restored bake nodes) while still ignored
+            context.view_layer.update()
+        finally:
+            _ignore_depsgraph_updates = False
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    if _ignore_depsgraph_updates:
+        return
+    _GROUP_CACHE.clear()
+    if not _PROTO_EXPORT_CACHE:
+        return
+
+    changed = set()
+    for update in depsgraph.updates:
+        idb = update.id.original
+        if isinstance(idb, _MEMO_GLOBAL_ID_TYPES):
+            _PROTO_EXPORT_CACHE.clear()
+            return
+        if isinstance(idb, bpy.types.Object):
+            # plain selection changes also report the object; only real edits count
+            if update.is_updated_geometry or update.is_updated_transform or update.is_updated_shading:
+                changed.add(idb.as_pointer())
+        elif isinstance(idb, (bpy.types.Mesh, bpy.types.Material)):
+            changed.add(idb.as_pointer())
+
+    if changed:
+        for proto in [p for p, (_, deps) in _PROTO_EXPORT_CACHE.items() if deps & changed]:
+            del _PROTO_EXPORT_CACHE[proto]
+
+
+@persistent
+def _clear_export_memo(*_args):
+    _PROTO_EXPORT_CACHE.clear()
+    _GROUP_CACHE.clear()
+
+
+_MEMO_HANDLERS = (
+    (bpy.app.handlers.depsgraph_update_post, _on_depsgraph_update),
+    (bpy.app.handlers.undo_post, _clear_export_memo),
+    (bpy.app.handlers.redo_post, _clear_export_memo),
+    (bpy.app.handlers.load_post, _clear_export_memo),
+)
+
+
+def register():
+    for handlers, fn in _MEMO_HANDLERS:
+        if fn not in handlers:
+            handlers.append(fn)
+
+
+def unregister():
+    for handlers, fn in _MEMO_HANDLERS:
+        if fn in handlers:
+            handlers.remove(fn)
+    _PROTO_EXPORT_CACHE.clear()
+    _GROUP_CACHE.clear()
+
+
+def prototype_is_up_to_date(context, obj, paths=None) -> bool:
+    """Cheap pre-check (no export) used to avoid dispatching unchanged prototypes to workers."""
+    s = context.scene.reforge_settings
+    proto_raw = get_prop(obj, "defold_prototype")
+    if not s.skip_unchanged or not proto_raw:
+        return False
+    proto = sanitize_id(proto_raw)
+    materials = iter_unique_materials_in_order(obj)
+    for m in materials:
+        ensure_material_props(m)
+    digest = prototype_digest(context, obj, proto, materials)
+    return _prototype_up_to_date(paths or export_paths(s), obj, proto, digest, bool(s.export_textures))
+
+
+def export_single_prototype_assets(context, obj, paths=None, baked_cache=None, texture_cache=None) -> str:
     """
     Export assets for ONE prototype:
       - <proto>.glb
@@ -100,8 +454,22 @@ def export_single_prototype_assets(context, obj) -> str:
       - create <proto>.go once (never overwritten)
       - optional collision: <proto>.convexshape + <proto>.collisionobject (overwritten)
       - optional bake: per-material PNGs (overwritten)
+      - <proto>.reforge.hash content digest; an unchanged prototype is skipped
+        (within one session already by the in-memory export memo)
+    paths: optional export_paths(settings), shared across a batch; without it the call is
+           a run of its own and starts with a fresh created-dirs cache.
+    baked_cache: optional read_bake_cache() dict, shared across a batch; identical bakes
+                 (same material, mesh and bake settings) are linked/copied instead of re-baked.
+    texture_cache: optional dict shared across a batch so shared images are exported once.
     Returns: proto id (sanitized)
     """
+    if paths is None:
+        clear_dir_cache()
+    with _exporter_updates(context):
+        return _export_single_prototype_assets(context, obj, paths, baked_cache, texture_cache)
+
+
+def _export_single_prototype_assets(context, obj, paths, baked_cache, texture_cache) -> str:
     s = context.scene.reforge_settings
     project_root = s.project_root
     if not project_root or not os.path.isdir(project_root):
@@ -116,15 +484,20 @@ def export_single_prototype_assets(context, obj) -> str:
     proto = sanitize_id(proto_raw)
 
     # absolute dirs
-    abs_models = os.path.join(project_root, s.models_dir)
-    abs_prefabs = os.path.join(project_root, s.prefabs_dir)
-    abs_textures = os.path.join(project_root, s.textures_dir)
-    abs_collisions = os.path.join(project_root, s.collisions_dir)
+    if paths is None:
+        paths = export_paths(s)
+    if texture_cache is None:
+        texture_cache = {}
+    abs_models = paths.abs_models
+    abs_prefabs = paths.abs_prefabs
+    abs_textures = paths.abs_textures
+    abs_collisions = paths.abs_collisions
 
     materials = iter_unique_materials_in_order(obj)
     for m in materials:
         ensure_material_props(m)
-    needs_bake = any(_material_prop_bool(m, "bake_color_texture") for m in materials)
+    bake_cfgs = [_mat_bake_cfg(m) for m in materials]
+    needs_bake = any(c.bake for c in bake_cfgs)
 
     # ensure dirs
     ensure_dir(abs_models)
@@ -144,68 +517,137 @@ def export_single_prototype_assets(context, obj) -> str:
     abs_go = os.path.join(abs_prefabs, go_filename)
 
     # project paths
-    glb_project_path = f"/{s.models_dir}/{glb_filename}".replace("\\", "/")
-    model_project_path = f"/{s.models_dir}/{model_filename}".replace("\\", "/")
+    glb_project_path = project_path(paths.models, glb_filename)
+    model_project_path = project_path(paths.models, model_filename)
+
+    # skip entirely when nothing feeding this prototype changed since the last export
+    memo_key = memo = None
+    if s.skip_unchanged:
+        memo_key = _export_memo_key(s, obj, materials)
+        memo = (memo_key, _export_memo_deps(obj, materials))
+        cached = _PROTO_EXPORT_CACHE.get(proto)
+        if cached is not None and cached[0] == memo_key and _prototype_files_exist(
+            paths, obj, proto, bool(s.export_textures)
+        ):
+            print(f"[Reforge] Prototype unchanged, skipped: {proto}")
+            return proto
+    _PROTO_EXPORT_CACHE.pop(proto, None)
+
+    abs_digest = os.path.join(abs_models, f"{proto}{PROTOTYPE_DIGEST_EXT}")
+    model_key = glb_key = digest = None
+    if s.skip_unchanged:
+        model_key = model_digest(s, obj, proto, materials)
+        glb_key = glb_digest(context, obj, materials)
+        digest = prototype_digest(context, obj, proto, materials, model_key, glb_key)
+    if digest is not None and _prototype_up_to_date(paths, obj, proto, digest, bool(s.export_textures)):
+        _PROTO_EXPORT_CACHE[proto] = memo
+        print(f"[Reforge] Prototype unchanged, skipped: {proto}")
+        return proto
+    safe_remove_file(abs_digest)
+
+    # materials unchanged: keep the .model and skip material/texture resolution.
+    # Baked textures depend on the mesh too, so prototypes with bakes always re-resolve.
+    reuse_model = (
+        model_key is not None and not needs_bake and _read_model_key(abs_model) == model_key
+        and _model_textures_exist(paths, abs_model, proto, bool(s.export_textures))
+    )
+
+    # mesh/transform/materials unchanged (only e.g. collision props changed): keep the GLB
+    abs_glb_fp = os.path.join(abs_models, f"{proto}{GLB_DIGEST_EXT}")
+    reuse_glb = glb_key is not None and os.path.isfile(abs_glb) and read_digest(abs_glb_fp) == glb_key
 
     # cleanup generated files (NEVER delete .go)
-    safe_remove_file(abs_glb)
-    safe_remove_file(abs_model)
+    if not reuse_glb:
+        safe_remove_file(abs_glb_fp)
+        safe_remove_file(abs_glb)
+    if not reuse_model:
+        safe_remove_file(abs_model)
 
     # cleanup collision generated
     safe_remove_file(os.path.join(abs_collisions, f"{proto}.convexshape"))
     safe_remove_file(os.path.join(abs_collisions, f"{proto}.collisionobject"))
 
     # export GLB from selection
-    select_only(obj)
-    export_glb_selected(abs_glb)
-
-    # build .model material blocks
-    blocks = []
-
-    if materials:
-        for mat in materials:
-            mat_name, defold_mat_path, defold_tex_path = resolve_defold_material_and_texture_for_material(
+    if not reuse_glb:
+        export_glb_selected(abs_glb, obj)
+        if glb_key is not None:
+            write_digest(abs_glb_fp, glb_key)
+
+    # a failed bake/texture export falls back to another texture: keep retrying it on every
+    # export instead of recording the prototype (or its .model) as up to date
+    export_failed = False
+
+    if not reuse_model:
+        # build .model material blocks
+        blocks = []
+
+        if materials:
+            slot_lookup = material_slot_lookup(obj) if needs_bake else None
+            mesh_key = mesh_digest(context, obj) if needs_bake and baked_cache is not None else None
+            # one Cycles setup for all baked materials of this prototype
+            with cycles_bake_session(context.scene):
+                for mat, cfg in zip(materials, bake_cfgs):
+                    mat_name, defold_mat_path, defold_tex_path, tex_ok = resolve_defold_material_and_texture_for_material(
+                        settings=s,
+                        mat=mat,
+                        abs_textures_dir=abs_textures,
+                        textures_dir_project=paths.textures,
+                        obj=obj,
+                        texture_cache=texture_cache,
+                    )
+
+                    # Bake overrides tex0 path (works with complex materials / Ucupaint)
+                    if cfg.bake:
+                        baked_filename = _make_baked_texture_filename(proto, mat_name)
+                        baked_abs = os.path.join(abs_textures, baked_filename)
+
+                        bake_key = None
+                        if mesh_key is not None:
+                            bake_key = bake_digest(mat, mesh_key, (cfg.res, cfg.pad, cfg.force_solid))
+                        baked_ok = bake_key is not None and _reuse_baked_texture(
+                            baked_cache, bake_key, abs_textures, baked_filename, bool(s.allow_hardlink_textures)
+                        )
+
+                        if not baked_ok:
+                            # overwrite old baked file to avoid _1/_2 naming issues
+                            safe_remove_file(baked_abs)
+
+                            baked_ok = bake_color_emit_png(
+                                obj=obj,
+                                mat=mat,
+                                out_abs_path=baked_abs,
+                                resolution=cfg.res,
+                                padding=cfg.pad,
+                                slot_lookup=slot_lookup,
+                                force_solid_when_constant=cfg.force_solid,
+                            )
+                            if baked_ok and bake_key is not None:
+                                _remember_baked_texture(baked_cache, bake_key, abs_textures, baked_filename)
+                        if baked_ok:
+                            defold_tex_path = project_path(paths.textures, baked_filename)
+                        else:
+                            export_failed = True
+                    elif not tex_ok:
+                        export_failed = True
+
+                    blocks.append((mat_name, defold_mat_path, defold_tex_path))
+        else:
+            # no materials on mesh -> use default single block
+            mat_name, defold_mat_path, defold_tex_path, _ = resolve_defold_material_and_texture_for_material(
                 settings=s,
-                mat=mat,
+                mat=None,
                 abs_textures_dir=abs_textures,
-                textures_dir_project=s.textures_dir,
-                obj=obj
+                textures_dir_project=paths.textures,
+                obj=obj,
+                texture_cache=texture_cache,
             )
-
-            # Bake overrides tex0 path (works with complex materials / Ucupaint)
-            if _material_prop_bool(mat, "bake_color_texture"):
-                bake_resolution = _material_prop_int(mat, "bake_resolution", 1024)
-                bake_padding = _material_prop_int(mat, "bake_padding", 8)
-                baked_filename = _make_baked_texture_filename(proto, mat_name)
-                baked_abs = os.path.join(abs_textures, baked_filename)
-
-                # overwrite old baked file to avoid _1/_2 naming issues
-                safe_remove_file(baked_abs)
-
-                baked_ok = bake_color_emit_png(
-                    obj=obj,
-                    mat=mat,
-                    out_abs_path=baked_abs,
-                    resolution=bake_resolution,
-                    padding=bake_padding,
-                )
-                if baked_ok:
-                    defold_tex_path = f"/{s.textures_dir}/{baked_filename}".replace("\\", "/")
-
             blocks.append((mat_name, defold_mat_path, defold_tex_path))
-    else:
-        # no materials on mesh -> use default single block
-        mat_name, defold_mat_path, defold_tex_path = resolve_defold_material_and_texture_for_material(
-            settings=s,
-            mat=None,
-            abs_textures_dir=abs_textures,
-            textures_dir_project=s.textures_dir,
-            obj=obj
-        )
-        blocks.append((mat_name, defold_mat_path, defold_tex_path))
-
-    # write .model
-    write_text_file(abs_model, make_model_text_multi(glb_project_path, proto, blocks))
+
+        # write .model
+        model_text = make_model_text_multi(glb_project_path, proto, blocks)
+        if model_key is not None and not export_failed:
+            model_text = f"{_MODEL_KEY_PREFIX}{model_key}\n" + model_text
+        write_text_file(abs_model, model_text)
 
     # optional collision
     collisionobject_project_path = None
@@ -216,8 +658,8 @@ def export_single_prototype_assets(context, obj) -> str:
         abs_convex = os.path.join(abs_collisions, f"{proto}.convexshape")
         abs_colobj = os.path.join(abs_collisions, f"{proto}.collisionobject")
 
-        convex_project_path = f"/{s.collisions_dir}/{proto}.convexshape".replace("\\", "/")
-        colobj_project_path = f"/{s.collisions_dir}/{proto}.collisionobject".replace("\\", "/")
+        convex_project_path = project_path(paths.collisions, f"{proto}.convexshape")
+        colobj_project_path = project_path(paths.collisions, f"{proto}.collisionobject")
 
         export_convex_hull_points(obj, abs_convex)
         write_text_file(abs_colobj, make_collisionobject_text(convex_project_path, group, mask))
@@ -227,38 +669,119 @@ def export_single_prototype_assets(context, obj) -> str:
     if not os.path.isfile(abs_go):
         write_text_file(abs_go, make_go_ref_model_text(model_project_path, collisionobject_project_path))
 
+    if digest is not None and not export_failed:
+        write_digest(abs_digest, digest)
+        _PROTO_EXPORT_CACHE[proto] = memo
+
     return proto
 
 
-def export_all_prototypes_assets_no_scene(context) -> int:
+def invalidate_prototype_groups():
+    """Drop cached prototype grouping (the next export rescans the scene)."""
+    _GROUP_CACHE.clear()
+
+
+def _prototype_tags(objs) -> tuple:
+    # defold_prototype values set from Python don't tag the depsgraph: compare them directly
+    # (pointers too, so added/removed objects never match either)
+    return tuple(
+        (o.as_pointer(), o.get("defold_prototype"), o.data.get("defold_prototype") if o.type == "MESH" else None)
+        for o in objs
+    )
+
+
+def _group_prototypes(context) -> dict:
     """
-    Export assets (.glb/.model/optional collisions/bake) for all prototypes in scene.
-    Does NOT regenerate .collection.
+    Sanitized prototype id -> list of MESH objects (first one is the etalon).
+    Respects export_visible_only. Raises if nothing is tagged.
+    The result is reused across export clicks until the depsgraph reports a change
+    or any object's defold_prototype value changes; the cache saves the visibility pass.
     """
-    s = context.scene.reforge_settings
-    view_layer = context.view_layer
+    # deliver pending updates (e.g. objects removed from a script) to the handler first
+    context.view_layer.update()
 
-    groups = {}
-    for obj in context.scene.objects:
+    s = context.scene.reforge_settings
+    key = (context.scene.as_pointer(), context.view_layer.as_pointer(), bool(s.export_visible_only))
+    tags = _prototype_tags(context.scene.objects)
+    cached = _GROUP_CACHE.get(key)
+    if cached is not None and cached[0] == tags:
+        return cached[1]
+    groups = _scan_proto_groups(context, s)
+    _GROUP_CACHE[key] = (tags, groups)
+    return groups
+
+
+def _scan_proto_groups(context, s) -> dict:
+    """One pass over the scene; see _group_prototypes."""
+    objs = context.scene.objects
+
+    candidates = objs
+    if s.export_visible_only:
+        # visibility of the whole scene computed once (bulk hide_viewport prefilter)
+        candidates = compress(objs, visible_mask(objs, context.view_layer))
+
+    # get_prop inlined: this loop runs once per scene object
+    tagged, tagged_protos = [], []
+    for obj in candidates:
         if obj.type != "MESH":
             continue
-        if s.export_visible_only and not is_object_visible(obj, view_layer):
-            continue
-        proto = get_prop(obj, "defold_prototype")
+        proto = obj.get("defold_prototype")
+        if proto is None:
+            proto = obj.data.get("defold_prototype")
         if not proto:
             continue
-        proto = sanitize_id(proto)
-        groups.setdefault(proto, []).append(obj)
+        tagged.append(obj)
+        tagged_protos.append(sanitize_id(proto))
+
+    # few prototypes, many objects: create the lists once (first-seen order), then plain appends
+    groups = {p: [] for p in dict.fromkeys(tagged_protos)}
+    for obj, proto in zip(tagged, tagged_protos):
+        groups[proto].append(obj)
 
     if not groups:
         raise RuntimeError("No MESH objects with 'defold_prototype' found (with current visibility filter).")
+    return groups
+
+
+def _export_etalons(context, s, paths, etalons):
+    """
+    Export assets for one etalon per prototype: in headless Blender workers when
+    parallel export is enabled and enough prototypes changed, otherwise in this process.
+    """
+    if s.parallel_export and len(etalons) >= MIN_PARALLEL_PROTOTYPES:
+        # don't start workers for prototypes that would be skipped anyway
+        etalons = [o for o in etalons if not prototype_is_up_to_date(context, o, paths)]
+
+    if s.parallel_export and len(etalons) >= MIN_PARALLEL_PROTOTYPES:
+        export_prototypes_parallel(etalons, s.parallel_workers)
+        return
+
+    baked_cache = read_bake_cache(paths.abs_textures)
+    baked_cache_read = dict(baked_cache)
+    texture_cache = {}
+    try:
+        with _exporter_updates(context), cycles_bake_session(context.scene):
+            for obj in etalons:
+                export_single_prototype_assets(context, obj, paths, baked_cache, texture_cache)
+    finally:
+        # entries are replaced, never mutated in place: a shallow copy is enough to compare
+        if baked_cache != baked_cache_read:
+            write_bake_cache(paths.abs_textures, baked_cache)
+
+
+def export_all_prototypes_assets_no_scene(context) -> int:
+    """
+    Export assets (.glb/.model/optional collisions/bake) for all prototypes in scene.
+    Does NOT regenerate .collection.
+    """
+    clear_dir_cache()
+    s = context.scene.reforge_settings
+    groups = _group_prototypes(context)
+    paths = export_paths(s)
 
-    n = 0
-    for proto in sorted(groups.keys()):
-        # export only "etalon" mesh for this proto
-        export_single_prototype_assets(context, groups[proto][0])
-        n += 1
-    return n
+    # export only "etalon" mesh for each proto
+    _export_etalons(context, s, paths, [groups[proto][0] for proto in sorted(groups.keys())])
+    return len(groups)
 
 
 def run_export_scene(context) -> str:
@@ -272,62 +795,44 @@ def run_export_scene(context) -> str:
               ...
     Returns absolute path to generated .collection
     """
+    clear_dir_cache()
     s = context.scene.reforge_settings
     project_root = s.project_root
     if not project_root or not os.path.isdir(project_root):
         raise RuntimeError("Project Root is empty or not found.")
 
-    abs_scenes = os.path.join(project_root, s.scenes_dir)
+    paths = export_paths(s)
+    abs_scenes = paths.abs_scenes
     ensure_dir(abs_scenes)
 
-    # group objects by prototype
-    groups = {}
-    view_layer = context.view_layer
-    for obj in context.scene.objects:
-        if obj.type != "MESH":
-            continue
-        if s.export_visible_only and not is_object_visible(obj, view_layer):
-            continue
-        proto = get_prop(obj, "defold_prototype")
-        if not proto:
-            continue
-        proto = sanitize_id(proto)
-        groups.setdefault(proto, []).append(obj)
+    groups = _group_prototypes(context)
 
-    if not groups:
-        raise RuntimeError("No MESH objects with 'defold_prototype' found (with current visibility filter).")
+    # export each prototype (etalon; .go created once)
+    _export_etalons(context, s, paths, [objs[0] for objs in groups.values()])
 
-    # ensure all prototypes are exported; create .go once
-    proto_to_go = {}
-    for proto, objs in groups.items():
-        export_single_prototype_assets(context, objs[0])
-        proto_to_go[proto] = f"/{s.prefabs_dir}/{proto}.go".replace("\\", "/")
+    # all instance transforms of the scene in one batch, consumed per group in order
+    trs_iter = iter(to_defold_trs_batch([o for objs in groups.values() for o in objs]))
 
-    # create instance list per proto
     instances_by_proto = {}
-    counters = {p: 0 for p in groups.keys()}
-
     for proto, objs in groups.items():
-        for obj in objs:
-            counters[proto] += 1
-            inst_id = f"{proto}_{counters[proto]:03d}"
-            pos, quat, scale = to_defold_trs(obj)
-            instances_by_proto.setdefault(proto, []).append({
-                "id": inst_id,
-                "prototype": proto_to_go[proto],
+        proto_go = project_path(paths.prefabs, f"{proto}.go")
+
+        instances = instances_by_proto[proto] = []
+        append = instances.append
+        for i, (obj, (pos, quat, scale)) in enumerate(zip(objs, trs_iter), 1):
+            append({
+                "id": f"{proto}_{i:03d}",
+                "prototype": proto_go,
                 "pos": pos,
                 "quat": quat,
                 "scale": scale,
             })
 
     protos_sorted = sorted(groups.keys())
-    collection_text = make_collection_text_grouped_embedded(
-        s.collection_name,
-        protos_sorted,
-        instances_by_proto
-    )
 
     abs_collection = os.path.join(abs_scenes, f"{s.collection_name}.collection")
     safe_remove_file(abs_collection)
-    write_text_file(abs_collection, collection_text)
+    # stream straight to disk: large scenes never hold the whole collection text in memory
+    with open(abs_collection, "w", buffering=1 << 20, encoding="utf-8", newline="\n") as fh:
+        write_collection_grouped_embedded(fh, s.collection_name, protos_sorted, instances_by_proto)
     return abs_collection
@@ -0,0 +1,37 @@
+# reforge/export_worker.py
+"""
+Headless worker used by parallel.export_prototypes_parallel. Not imported by the add-on.
+
+  blender --background --factory-startup <copy.blend> --python export_worker.py -- <object> [<object> ...]
+"""
+import importlib
+import os
+import sys
+import traceback
+
+import bpy
+
+
+def main(argv):
+    obj_names = argv[argv.index("--") + 1:] if "--" in argv else []
+
+    # import the add-on package from its folder (factory startup has no add-ons enabled)
+    pkg_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.insert(0, os.path.dirname(pkg_dir))
+    pkg = importlib.import_module(os.path.basename(pkg_dir))
+    pkg.register()
+    export_core = importlib.import_module(pkg.__name__ + ".export_core")
+
+    for name in obj_names:
+        obj = bpy.data.objects.get(name)
+        if obj is None:
+            raise RuntimeError(f"Object not found in worker file: {name}")
+        proto = export_core.export_single_prototype_assets(bpy.context, obj)
+        print(f"[Reforge] Worker exported prototype: {proto}")
+
+
+try:
+    main(sys.argv)
+except Exception:
+    traceback.print_exc()
+    sys.exit(1)
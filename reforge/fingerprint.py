@@ -0,0 +1,292 @@
+# reforge/fingerprint.py
+import hashlib
+import json
+import os
+import bpy
+import numpy as np
+
+from .utils import write_text_file
+
+# Bump when the digest layout changes so old sidecars are invalidated
+_DIGEST_VERSION = b"reforge-fp-5"
+
+PROTOTYPE_DIGEST_EXT = ".reforge.hash"
+GLB_DIGEST_EXT = ".glb.fp"
+BAKE_CACHE_FILENAME = "baked_cache.json"
+
+OBJECT_DIGEST_KEYS = ("defold_collision", "collision_group", "collision_mask", "defold_material", "defold_texture")
+MATERIAL_DIGEST_KEYS = (
+    "defold_material",
+    "defold_texture",
+    "bake_color_texture",
+    "bake_resolution",
+    "bake_padding",
+    "force_solid_when_constant",
+)
+
+# Node RNA props that only affect the editor, never the shading result
+_NODE_UI_PROPS = {
+    "name", "label", "location", "location_absolute", "width", "height", "dimensions",
+    "select", "hide", "color", "use_custom_color", "show_options", "show_preview", "show_texture",
+}
+_NODE_VALUE_TYPES = {"BOOLEAN", "INT", "FLOAT", "STRING", "ENUM"}
+
+
+def _new_hash():
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_DIGEST_VERSION)
+    return h
+
+
+def _update_str(h, v):
+    h.update(repr(v).encode("utf-8"))
+    h.update(b"\0")
+
+
+def _update_array(h, collection, attr: str, count: int, dtype):
+    buf = np.empty(count, dtype=dtype)
+    if count:
+        collection.foreach_get(attr, buf)
+    h.update(buf.tobytes())
+
+
+def _plain(v):
+    """RNA arrays (colors, vectors) -> tuple, enum flag sets -> sorted tuple; everything else as-is."""
+    if isinstance(v, (set, frozenset)):
+        return tuple(sorted(v))
+    try:
+        return tuple(v) if not isinstance(v, str) else v
+    except TypeError:
+        return v
+
+
+def _update_mesh(h, mesh: bpy.types.Mesh):
+    _update_str(h, (len(mesh.vertices), len(mesh.loops), len(mesh.polygons)))
+    _update_array(h, mesh.vertices, "co", len(mesh.vertices) * 3, np.float32)
+    _update_array(h, mesh.polygons, "loop_total", len(mesh.polygons), np.int32)
+    _update_array(h, mesh.polygons, "material_index", len(mesh.polygons), np.int32)
+    _update_array(h, mesh.loops, "vertex_index", len(mesh.loops), np.int32)
+    for uv in mesh.uv_layers:
+        _update_str(h, uv.name)
+        _update_array(h, uv.data, "uv", len(mesh.loops) * 2, np.float32)
+
+    # per-corner normals: cover smooth/flat shading, sharp edges and custom split normals
+    corner_normals = getattr(mesh, "corner_normals", None)  # Blender 4.1+
+    if corner_normals is not None:
+        _update_array(h, corner_normals, "vector", len(corner_normals) * 3, np.float32)
+    else:
+        _update_array(h, mesh.loops, "normal", len(mesh.loops) * 3, np.float32)
+
+    color_attributes = getattr(mesh, "color_attributes", ())
+    _update_str(h, getattr(color_attributes, "render_color_index", None))
+    for attr in color_attributes:
+        _update_str(h, (attr.name, attr.domain, attr.data_type))
+        _update_array(h, attr.data, "color", len(attr.data) * 4, np.float32)
+
+
+def _image_file_stat(img) -> tuple:
+    """(abs source path, size, mtime_ns) of an image's file; size/mtime are 0 when missing or packed."""
+    src = bpy.path.abspath(img.filepath) if img.filepath else ""
+    try:
+        st = os.stat(src) if src else None
+    except OSError:
+        st = None
+    return (src, st.st_size if st else 0, st.st_mtime_ns if st else 0)
+
+
+def _update_image(h, img):
+    if img is None:
+        _update_str(h, None)
+        return
+    _update_str(h, (img.name,) + _image_file_stat(img) + (tuple(img.size),))
+
+
+def _collect_images(nt, images: dict, seen: set):
+    ptr = nt.as_pointer()
+    if ptr in seen:
+        return
+    seen.add(ptr)
+    for n in nt.nodes:
+        if n.type == "TEX_IMAGE":
+            img = getattr(n, "image", None)
+            if img is not None:
+                images[img.as_pointer()] = img
+        sub = getattr(n, "node_tree", None)
+        if sub is not None:
+            _collect_images(sub, images, seen)
+
+
+def image_file_stats(materials) -> tuple:
+    """
+    _image_file_stat of every image used by materials' node trees (group nodes included).
+    Cheap check for image files edited on disk, which Blender reports to no handler.
+    """
+    images, seen = {}, set()
+    for mat in materials:
+        if mat.use_nodes and mat.node_tree:
+            _collect_images(mat.node_tree, images, seen)
+    return tuple(_image_file_stat(img) for img in images.values())
+
+
+def _update_node_tree(h, nt, seen: set):
+    ptr = nt.as_pointer()
+    if ptr in seen:
+        return
+    seen.add(ptr)
+
+    for n in sorted(nt.nodes, key=lambda n: n.name):
+        _update_str(h, (n.name, n.bl_idname, n.mute))
+        for prop in n.bl_rna.properties:
+            ident = prop.identifier
+            if prop.is_readonly or prop.type not in _NODE_VALUE_TYPES:
+                continue
+            if ident in _NODE_UI_PROPS or ident.startswith("bl_"):
+                continue
+            _update_str(h, (ident, _plain(getattr(n, ident, None))))
+        for inp in n.inputs:
+            if hasattr(inp, "default_value"):
+                _update_str(h, (inp.identifier, _plain(inp.default_value)))
+        if n.type == "TEX_IMAGE":
+            _update_image(h, getattr(n, "image", None))
+        sub = getattr(n, "node_tree", None)
+        if sub is not None:
+            _update_node_tree(h, sub, seen)
+
+    # sorted: link order changes whenever links are removed/re-added (e.g. around a bake)
+    _update_str(h, sorted(
+        (l.from_node.name, l.from_socket.identifier, l.to_node.name, l.to_socket.identifier, l.is_muted)
+        for l in nt.links
+    ))
+
+
+def _update_material(h, mat: bpy.types.Material):
+    _update_str(h, mat.name)
+    for k in MATERIAL_DIGEST_KEYS:
+        _update_str(h, (k, _plain(mat.get(k))))
+    if mat.use_nodes and mat.node_tree:
+        _update_node_tree(h, mat.node_tree, set())
+    else:
+        _update_str(h, tuple(mat.diffuse_color))
+
+
+def _update_evaluated_mesh(h, context, obj: bpy.types.Object):
+    obj_eval = obj.evaluated_get(context.evaluated_depsgraph_get())
+    mesh = obj_eval.to_mesh()
+    try:
+        _update_mesh(h, mesh)
+    finally:
+        obj_eval.to_mesh_clear()
+
+
+def model_digest(s, obj: bpy.types.Object, proto: str, materials) -> str:
+    """
+    Digest of everything the .model text is resolved from: materials (node graphs, images,
+    props), the object's material/texture overrides and the relevant exporter settings.
+    """
+    h = _new_hash()
+    _update_str(h, (
+        "model", proto, s.models_dir, s.textures_dir,
+        s.default_material, bool(s.export_textures),
+        obj.get("defold_material"), obj.get("defold_texture"),
+    ))
+    for mat in materials:
+        _update_material(h, mat)
+    return h.hexdigest()
+
+
+def glb_digest(context, obj: bpy.types.Object, materials) -> str:
+    """Digest of what the exported GLB is built from: evaluated mesh + UVs, world transform, materials."""
+    h = _new_hash()
+    _update_str(h, ("glb", [tuple(row) for row in obj.matrix_world]))
+    _update_evaluated_mesh(h, context, obj)
+    for mat in materials:
+        _update_material(h, mat)
+    return h.hexdigest()
+
+
+def prototype_digest(
+    context, obj: bpy.types.Object, proto: str, materials, model_key: str = None, glb_key: str = None
+) -> str:
+    """
+    Content digest of everything that feeds one prototype's exported files:
+    evaluated mesh + UVs, world transform, materials (node graphs, images, props),
+    object export props and exporter settings.
+    model_key / glb_key: model_digest() / glb_digest() when the caller already has them.
+    """
+    s = context.scene.reforge_settings
+    h = _new_hash()
+
+    _update_str(h, (
+        proto, s.models_dir, s.prefabs_dir, s.textures_dir, s.collisions_dir,
+        s.default_material, bool(s.export_textures),
+    ))
+    for k in OBJECT_DIGEST_KEYS:
+        _update_str(h, (k, _plain(obj.get(k)), _plain(obj.data.get(k))))
+    h.update((glb_key or glb_digest(context, obj, materials)).encode("ascii"))
+    h.update((model_key or model_digest(s, obj, proto, materials)).encode("ascii"))
+
+    return h.hexdigest()
+
+
+def read_digest(abs_path: str) -> str:
+    try:
+        with open(abs_path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def write_digest(abs_path: str, digest: str):
+    write_text_file(abs_path, digest + "\n")
+
+
+def mesh_digest(context, obj: bpy.types.Object) -> str:
+    """Digest of the evaluated mesh (geometry + UVs) a texture gets baked onto."""
+    h = _new_hash()
+    _update_evaluated_mesh(h, context, obj)
+    return h.hexdigest()
+
+
+def bake_digest(mat: bpy.types.Material, mesh_key: str, bake_params) -> str:
+    """
+    Key of one baked texture: material content + mesh_digest of the target + bake settings.
+    The UV layout decides where the color lands, so the mesh is part of the key.
+    """
+    h = _new_hash()
+    _update_str(h, ("bake", mesh_key, tuple(bake_params)))
+    _update_material(h, mat)
+    return h.hexdigest()
+
+
+def _is_bake_cache_entry(entry) -> bool:
+    if not isinstance(entry, list) or len(entry) != 3:
+        return False
+    filename, size, mtime_ns = entry
+    return (
+        isinstance(filename, str) and bool(filename) and os.path.basename(filename) == filename
+        and type(size) is int and type(mtime_ns) is int
+    )
+
+
+def read_bake_cache(abs_textures_dir: str) -> dict:
+    """
+    bake_digest -> [filename, size, mtime_ns] of the PNG baked for it; {} when missing/corrupt.
+    The file may be hand-edited or from an older version: malformed entries are dropped.
+    """
+    try:
+        with open(os.path.join(abs_textures_dir, BAKE_CACHE_FILENAME), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if _is_bake_cache_entry(v)}
+
+
+def write_bake_cache(abs_textures_dir: str, cache: dict):
+    if not os.path.isdir(abs_textures_dir):
+        return
+    write_text_file(
+        os.path.join(abs_textures_dir, BAKE_CACHE_FILENAME),
+        json.dumps(cache, indent=1, sort_keys=True) + "\n",
+    )
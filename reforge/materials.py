@@ -1,9 +1,9 @@
 import os
-import shutil
+from collections import deque
 import bpy
 from typing import Optional, List, Tuple
 
-from .utils import ensure_dir, sanitize_id
+from .utils import ensure_dir, sanitize_id, project_path, copy_file_fast, id_props, safe_remove_file
 
 DEFAULT_DEFOLD_TEXTURE = "/builtins/assets/images/logo/logo_256.png"
 DEFAULT_BAKE_RESOLUTION = 1024
@@ -12,33 +12,26 @@ DEFAULT_BAKE_PADDING = 8
 def ensure_material_props(mat: Optional[bpy.types.Material]):
     if not mat:
         return
-    if "defold_material" not in mat:
-        mat["defold_material"] = ""
-    if "defold_texture" not in mat:
-        mat["defold_texture"] = ""
-    if "bake_color_texture" not in mat:
-        mat["bake_color_texture"] = False
-    if "bake_resolution" not in mat:
-        mat["bake_resolution"] = DEFAULT_BAKE_RESOLUTION
-    if "bake_padding" not in mat:
-        mat["bake_padding"] = DEFAULT_BAKE_PADDING
+    idp = id_props(mat)
+    if "defold_material" not in idp:
+        idp["defold_material"] = ""
+    if "defold_texture" not in idp:
+        idp["defold_texture"] = ""
+    if "bake_color_texture" not in idp:
+        idp["bake_color_texture"] = False
+    if "bake_resolution" not in idp:
+        idp["bake_resolution"] = DEFAULT_BAKE_RESOLUTION
+    if "bake_padding" not in idp:
+        idp["bake_padding"] = DEFAULT_BAKE_PADDING
+    if "force_solid_when_constant" not in idp:
+        idp["force_solid_when_constant"] = True
 
 def iter_unique_materials_in_order(obj: bpy.types.Object) -> List[bpy.types.Material]:
-    result, seen = [], set()
-    mats = []
-    try:
-        mats = list(obj.data.materials) if obj and obj.data else []
-    except Exception:
-        mats = []
-    for m in mats:
-        if not m:
-            continue
-        ptr = m.as_pointer()
-        if ptr in seen:
-            continue
-        seen.add(ptr)
-        result.append(m)
-    return result
+    data = obj.data if obj else None
+    if not data or not hasattr(data, "materials"):
+        return []
+    # dict keeps first-seen order; one hash op per slot
+    return list({m.as_pointer(): m for m in data.materials if m}.values())
 
 def find_basecolor_image_from_material(mat: bpy.types.Material):
     if not mat or not mat.use_nodes or not mat.node_tree:
@@ -55,27 +48,51 @@ def find_basecolor_image_from_material(mat: bpy.types.Material):
 
     start_node = base_input.links[0].from_socket.node
 
-    visited, stack = set(), [start_node]
-    while stack:
-        node = stack.pop()
-        if node in visited:
-            continue
-        visited.add(node)
+    # BFS: the image is usually one or two hops from the shader, so level order finds it first
+    visited, queue = {start_node.name}, deque((start_node,))
+    popleft, append, seen_add = queue.popleft, queue.append, visited.add
+    while queue:
+        node = popleft()
 
-        if node.type == "TEX_IMAGE" and getattr(node, "image", None):
+        if node.type == "TEX_IMAGE" and node.image:
             return node.image
 
-        for inp in getattr(node, "inputs", []):
+        for inp in node.inputs:
             if inp.is_linked:
-                try:
-                    stack.append(inp.links[0].from_socket.node)
-                except Exception:
-                    pass
+                up = inp.links[0].from_socket.node
+                if up.name not in visited:
+                    seen_add(up.name)
+                    append(up)
     return None
 
-def export_image_to_defold_project(image: bpy.types.Image, textures_abs_dir: str) -> Optional[str]:
+def _is_copy_current(src_abs: str, dst_abs: str) -> bool:
+    # copies keep the source mtime, so an untouched earlier copy has equal size and mtime >= source
+    try:
+        src_st = os.stat(src_abs)
+        dst_st = os.stat(dst_abs)
+    except OSError:
+        return False
+    return dst_st.st_size == src_st.st_size and dst_st.st_mtime >= src_st.st_mtime
+
+def export_image_to_defold_project(
+    image: bpy.types.Image,
+    textures_abs_dir: str,
+    texture_cache: Optional[dict] = None,
+    allow_hardlink: bool = False,
+) -> Optional[str]:
+    """
+    Copy (or save) image into the textures dir. Returns the written filename.
+    texture_cache: optional per-export-run dict; an image already exported in this run
+    (by pointer, or by source/destination path) is not copied again.
+    allow_hardlink: hardlink instead of copy when source and textures dir share a filesystem.
+    """
     if not image:
         return None
+
+    ptr = image.as_pointer()
+    if texture_cache is not None and ptr in texture_cache:
+        return texture_cache[ptr]
+
     ensure_dir(textures_abs_dir)
 
     src_abs = None
@@ -91,16 +108,33 @@ def export_image_to_defold_project(image: bpy.types.Image, textures_abs_dir: str
 
     dst_abs = os.path.join(textures_abs_dir, filename)
 
+    path_key = (src_abs, dst_abs) if src_abs else None
+    if texture_cache is not None and path_key in texture_cache:
+        texture_cache[ptr] = texture_cache[path_key]
+        return texture_cache[ptr]
+
     try:
         if src_abs:
-            shutil.copy2(src_abs, dst_abs)
+            if not _is_copy_current(src_abs, dst_abs):
+                copy_file_fast(src_abs, dst_abs, allow_hardlink)
         else:
-            image.save_render(dst_abs)
+            # same temp-name + rename as copy_file_fast: workers may write the same image
+            tmp_abs = f"{dst_abs}.{os.getpid()}.tmp"
+            try:
+                image.save_render(tmp_abs)
+                os.replace(tmp_abs, dst_abs)
+            finally:
+                safe_remove_file(tmp_abs)
     except Exception as e:
         print(f"[Reforge][WARN] Failed to export texture '{image.name}' -> {dst_abs}: {e}")
         return None
 
-    return os.path.basename(dst_abs)
+    saved_name = os.path.basename(dst_abs)
+    if texture_cache is not None:
+        texture_cache[ptr] = saved_name
+        if path_key:
+            texture_cache[path_key] = saved_name
+    return saved_name
 
 def resolve_defold_material_and_texture_for_material(
     settings,
@@ -108,7 +142,11 @@ def resolve_defold_material_and_texture_for_material(
     abs_textures_dir: str,
     textures_dir_project: str,
     obj: Optional[bpy.types.Object] = None,
-) -> Tuple[str, str, str]:
+    texture_cache: Optional[dict] = None,
+) -> Tuple[str, str, str, bool]:
+    # -> (material name, Defold material path, Defold texture path, texture ok).
+    # texture ok is False when the base color image could not be exported and the
+    # texture path fell back to the built-in one.
     # material name in .model must match glTF material name
     mat_name = mat.name if (mat and mat.name) else "default"
 
@@ -126,6 +164,7 @@ def resolve_defold_material_and_texture_for_material(
     if not defold_mat_path:
         defold_mat_path = (settings.default_material or "").strip() or "/builtins/materials/model.material"
 
+    tex_ok = True
     defold_tex_path = ""
     if mat:
         defold_tex_path = _get_custom_prop_str(mat, "defold_texture")
@@ -136,14 +175,18 @@ def resolve_defold_material_and_texture_for_material(
         img = find_basecolor_image_from_material(mat) if mat else None
         if img:
             if settings.export_textures:
-                saved_name = export_image_to_defold_project(img, abs_textures_dir)
+                saved_name = export_image_to_defold_project(
+                    img, abs_textures_dir, texture_cache, bool(settings.allow_hardlink_textures)
+                )
                 if saved_name:
-                    defold_tex_path = f"/{textures_dir_project}/{saved_name}".replace("\\", "/")
+                    defold_tex_path = project_path(textures_dir_project, saved_name)
+                else:
+                    tex_ok = False
             else:
                 if img.filepath:
-                    defold_tex_path = f"/{textures_dir_project}/{os.path.basename(bpy.path.abspath(img.filepath))}".replace("\\", "/")
+                    defold_tex_path = project_path(textures_dir_project, os.path.basename(bpy.path.abspath(img.filepath)))
 
     if not defold_tex_path:
         defold_tex_path = DEFAULT_DEFOLD_TEXTURE
 
-    return mat_name, defold_mat_path, defold_tex_path
+    return mat_name, defold_mat_path, defold_tex_path, tex_ok
@@ -1,13 +1,15 @@
 import bpy
-import re
+from collections import namedtuple
+from itertools import compress
 
 from .export_core import (
     run_export_scene,
     export_single_prototype_assets,
     export_all_prototypes_assets_no_scene,
+    invalidate_prototype_groups,
 )
 from .materials import ensure_material_props
-from .utils import is_object_visible, sanitize_id
+from .utils import visible_mask, sanitize_name, id_props
 
 # Keys to clear (exporter-created)
 OBJECT_EXPORT_KEYS = ("defold_prototype", "defold_collision", "collision_group", "collision_mask")
@@ -17,15 +19,13 @@ MATERIAL_EXPORT_KEYS = (
     "bake_color_texture",
     "bake_resolution",
     "bake_padding",
+    "force_solid_when_constant",
 )
 
 
 # ------------------------------------------------------------
 # Duplicate name detection (.001/.002 -> base)
 # ------------------------------------------------------------
-_DUPLICATE_SUFFIX_RE = re.compile(r"^(.*)\.\d{3}$")
-
-
 def compute_prototype_name(obj_name: str, detect_duplicates: bool) -> str:
     """
     If detect_duplicates is enabled:
@@ -36,31 +36,17 @@ def compute_prototype_name(obj_name: str, detect_duplicates: bool) -> str:
     Always sanitized to be a stable Defold id / filename friendly string.
     """
     base = obj_name
-    if detect_duplicates:
-        m = _DUPLICATE_SUFFIX_RE.match(obj_name)
-        if m:
-            base = m.group(1)
-    return sanitize_id(base)
+    # fixed-shape ".NNN" suffix: slice check, no regex (isdecimal == regex \d)
+    if detect_duplicates and len(obj_name) >= 4 and obj_name[-4] == "." and obj_name[-3:].isdecimal():
+        base = obj_name[:-4]
+    return sanitize_name(base)
 
 
 # ------------------------------------------------------------
 # SAFE CLEAR (only our keys)
 # ------------------------------------------------------------
-def _collect_materials_from_objects(objects):
-    mats, seen = [], set()
-    for obj in objects:
-        data = getattr(obj, "data", None)
-        if not data or not hasattr(data, "materials"):
-            continue
-        for m in data.materials:
-            if not m:
-                continue
-            ptr = m.as_pointer()
-            if ptr in seen:
-                continue
-            seen.add(ptr)
-            mats.append(m)
-    return mats
+_OBJECT_EXPORT_SET = frozenset(OBJECT_EXPORT_KEYS)
+_MATERIAL_EXPORT_SET = frozenset(MATERIAL_EXPORT_KEYS)
 
 
 def safe_clear_for_objects(objects) -> dict:
@@ -68,82 +54,108 @@ def safe_clear_for_objects(objects) -> dict:
     Clears ONLY exporter-created properties:
       - Object: OBJECT_EXPORT_KEYS
       - Materials used by these objects: MATERIAL_EXPORT_KEYS
+    objects: any iterable (e.g. scene.objects directly), walked once.
     """
-    mats = _collect_materials_from_objects(objects)
+    mats_by_ptr = {}
+    obj_count = 0
     deleted = 0
 
+    # one keys() call per ID, intersected with our key set (usually empty or tiny)
     for obj in objects:
-        for k in OBJECT_EXPORT_KEYS:
-            if k in obj.keys():
-                try:
-                    del obj[k]
-                    deleted += 1
-                except Exception:
-                    pass
-
-    for m in mats:
-        for k in MATERIAL_EXPORT_KEYS:
-            if k in m.keys():
-                try:
-                    del m[k]
-                    deleted += 1
-                except Exception:
-                    pass
-
-    return {"objects": len(objects), "materials": len(mats), "deleted_keys": deleted}
+        obj_count += 1
+        data = obj.data
+        if data is not None and hasattr(data, "materials"):
+            for m in data.materials:
+                if m:
+                    mats_by_ptr[m.as_pointer()] = m
+
+        for k in _OBJECT_EXPORT_SET.intersection(obj.keys()):
+            try:
+                del obj[k]
+                deleted += 1
+            except Exception:
+                pass
+
+    for m in mats_by_ptr.values():
+        for k in _MATERIAL_EXPORT_SET.intersection(m.keys()):
+            try:
+                del m[k]
+                deleted += 1
+            except Exception:
+                pass
+
+    invalidate_prototype_groups()
+    return {"objects": obj_count, "materials": len(mats_by_ptr), "deleted_keys": deleted}
+
+
+def _visible_scene_objects(context) -> list:
+    objs = context.scene.objects
+    return list(compress(objs, visible_mask(objs, context.view_layer)))
 
 
 # ------------------------------------------------------------
 # SET PROPS helpers
 # ------------------------------------------------------------
-def _set_custom_prop(obj, key, value, overwrite: bool) -> bool:
-    if (obj.get(key) is None) or overwrite:
-        obj[key] = value
-        return True
-    return False
+# set / skipped counts per exporter key, in _SET_REPORT order
+_SetCounts = namedtuple("_SetCounts", "proto proto_skip col col_skip grp grp_skip msk msk_skip")
+_SET_REPORT = "proto {}/{} | col {}/{} | group {}/{} | mask {}/{}"
 
 
 def _set_properties_for_objects(context, objects):
+    """objects: any iterable (e.g. scene.objects directly), walked once."""
     s = context.scene.reforge_settings
 
-    changed = {
-        "proto": 0, "proto_skip": 0,
-        "col": 0, "col_skip": 0,
-        "grp": 0, "grp_skip": 0,
-        "msk": 0, "msk_skip": 0,
-    }
-
+    # settings read once; the per-object body is inlined (this runs over whole scenes)
+    detect_duplicates = bool(s.detect_duplicates)
+    ov_p = bool(s.overwrite_prototype)
+    ov_c = bool(s.overwrite_collision)
+    ov_g = bool(s.overwrite_collision_group)
+    ov_m = bool(s.overwrite_collision_mask)
+    col_value = bool(s.set_defold_collision_value)
     group_value = (s.set_collision_group_value or "").strip() or "default"
     mask_value = (s.set_collision_mask_value or "").strip() or "default"
 
-    for obj in objects:
-        proto_value = compute_prototype_name(obj.name, s.detect_duplicates)
+    proto_set = proto_skip = col_set = col_skip = grp_set = grp_skip = msk_set = msk_skip = 0
+    mat_seen = set()
 
-        if _set_custom_prop(obj, "defold_prototype", proto_value, s.overwrite_prototype):
-            changed["proto"] += 1
+    for obj in objects:
+        idp = id_props(obj)
+        if ov_p or idp.get("defold_prototype") is None:
+            idp["defold_prototype"] = compute_prototype_name(obj.name, detect_duplicates)
+            proto_set += 1
         else:
-            changed["proto_skip"] += 1
+            proto_skip += 1
 
-        if _set_custom_prop(obj, "defold_collision", bool(s.set_defold_collision_value), s.overwrite_collision):
-            changed["col"] += 1
+        if ov_c or idp.get("defold_collision") is None:
+            idp["defold_collision"] = col_value
+            col_set += 1
         else:
-            changed["col_skip"] += 1
+            col_skip += 1
 
-        if _set_custom_prop(obj, "collision_group", group_value, s.overwrite_collision_group):
-            changed["grp"] += 1
+        if ov_g or idp.get("collision_group") is None:
+            idp["collision_group"] = group_value
+            grp_set += 1
         else:
-            changed["grp_skip"] += 1
+            grp_skip += 1
 
-        if _set_custom_prop(obj, "collision_mask", mask_value, s.overwrite_collision_mask):
-            changed["msk"] += 1
+        if ov_m or idp.get("collision_mask") is None:
+            idp["collision_mask"] = mask_value
+            msk_set += 1
         else:
-            changed["msk_skip"] += 1
+            msk_skip += 1
 
-    mats = _collect_materials_from_objects(objects)
-    for m in mats:
-        ensure_material_props(m)
+        # materials in the same pass: props ensured once, on first sight
+        data = obj.data
+        if data is not None and hasattr(data, "materials"):
+            for m in data.materials:
+                if m:
+                    ptr = m.as_pointer()
+                    if ptr not in mat_seen:
+                        mat_seen.add(ptr)
+                        ensure_material_props(m)
 
-    return changed
+    invalidate_prototype_groups()
+    return _SetCounts(proto_set, proto_skip, col_set, col_skip, grp_set, grp_skip, msk_set, msk_skip)
 
 
 # ------------------------------------------------------------
@@ -216,13 +228,7 @@ class REFORGE_OT_set_selected(bpy.types.Operator):
             return {'CANCELLED'}
 
         ch = _set_properties_for_objects(context, objs)
-        self.report(
-            {'INFO'},
-            f"proto {ch['proto']}/{ch['proto_skip']} | "
-            f"col {ch['col']}/{ch['col_skip']} | "
-            f"group {ch['grp']}/{ch['grp_skip']} | "
-            f"mask {ch['msk']}/{ch['msk_skip']}"
-        )
+        self.report({'INFO'}, _SET_REPORT.format(*ch))
         return {'FINISHED'}
 
 
@@ -233,19 +239,13 @@ class REFORGE_OT_set_visible(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        objs = [o for o in context.scene.objects if is_object_visible(o, context.view_layer)]
+        objs = _visible_scene_objects(context)
         if not objs:
             self.report({'WARNING'}, "No visible objects found")
             return {'CANCELLED'}
 
         ch = _set_properties_for_objects(context, objs)
-        self.report(
-            {'INFO'},
-            f"proto {ch['proto']}/{ch['proto_skip']} | "
-            f"col {ch['col']}/{ch['col_skip']} | "
-            f"group {ch['grp']}/{ch['grp_skip']} | "
-            f"mask {ch['msk']}/{ch['msk_skip']}"
-        )
+        self.report({'INFO'}, _SET_REPORT.format(*ch))
         return {'FINISHED'}
 
 
@@ -256,19 +256,13 @@ class REFORGE_OT_set_all(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        objs = list(context.scene.objects)
-        if not objs:
+        objs = context.scene.objects
+        if not len(objs):
             self.report({'WARNING'}, "No objects in scene")
             return {'CANCELLED'}
 
         ch = _set_properties_for_objects(context, objs)
-        self.report(
-            {'INFO'},
-            f"proto {ch['proto']}/{ch['proto_skip']} | "
-            f"col {ch['col']}/{ch['col_skip']} | "
-            f"group {ch['grp']}/{ch['grp_skip']} | "
-            f"mask {ch['msk']}/{ch['msk_skip']}"
-        )
+        self.report({'INFO'}, _SET_REPORT.format(*ch))
         return {'FINISHED'}
 
 
@@ -305,7 +299,7 @@ class REFORGE_OT_clear_visible(bpy.types.Operator):
         return context.window_manager.invoke_confirm(self, event)
 
     def execute(self, context):
-        objs = [o for o in context.scene.objects if is_object_visible(o, context.view_layer)]
+        objs = _visible_scene_objects(context)
         if not objs:
             self.report({'WARNING'}, "No visible objects found")
             return {'CANCELLED'}
@@ -325,8 +319,8 @@ class REFORGE_OT_clear_all(bpy.types.Operator):
         return context.window_manager.invoke_confirm(self, event)
 
     def execute(self, context):
-        objs = list(context.scene.objects)
-        if not objs:
+        objs = context.scene.objects
+        if not len(objs):
             self.report({'WARNING'}, "No objects in scene")
             return {'CANCELLED'}
 
@@ -0,0 +1,66 @@
+# reforge/parallel.py
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import bpy
+
+# Below this many prototypes, starting Blender workers costs more than it saves
+MIN_PARALLEL_PROTOTYPES = 4
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "export_worker.py")
+
+
+def _run_worker(blend_path: str, obj_names: list) -> int:
+    cmd = [
+        bpy.app.binary_path,
+        "--background",
+        "--factory-startup",
+        "--python-exit-code", "1",
+        blend_path,
+        "--python", WORKER_SCRIPT,
+        "--",
+        *obj_names,
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+
+    for line in proc.stdout.splitlines():
+        if line.startswith("[Reforge]"):
+            print(line)
+
+    if proc.returncode != 0:
+        tail = (proc.stdout + proc.stderr)[-2000:]
+        raise RuntimeError(f"Export worker failed (exit {proc.returncode}):\n{tail}")
+    return len(obj_names)
+
+
+def export_prototypes_parallel(etalons, workers: int) -> int:
+    """
+    Export prototype assets in headless Blender processes.
+    etalons: one etalon object per prototype.
+
+    The current file is saved as a temporary copy; each worker opens it and runs
+    export_single_prototype_assets for its share of the etalons.
+    Returns number of exported prototypes.
+    """
+    names = [o.name for o in etalons]
+    if not names:
+        return 0
+    workers = max(1, min(int(workers), len(names)))
+
+    tmp_dir = tempfile.mkdtemp(prefix="reforge_")
+    try:
+        tmp_blend = os.path.join(tmp_dir, "reforge_export.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=tmp_blend, copy=True)
+
+        chunks = [names[i::workers] for i in range(workers)]
+        n = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_worker, tmp_blend, chunk) for chunk in chunks if chunk]
+            for fut in as_completed(futures):
+                n += fut.result()
+        return n
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -1,5 +1,5 @@
 import bpy
-from bpy.props import StringProperty, BoolProperty, PointerProperty
+from bpy.props import StringProperty, BoolProperty, IntProperty, PointerProperty
 
 BUILTIN_DEFAULT_DEFOLD_MATERIAL = "/builtins/materials/model.material"
 
@@ -17,6 +17,23 @@ class ReforgeSettings(bpy.types.PropertyGroup):
 
     export_visible_only: BoolProperty(name="Export Visible Only", default=True)
     export_textures: BoolProperty(name="Export Textures to Defold Project", default=True)
+    allow_hardlink_textures: BoolProperty(
+        name="Hardlink Textures",
+        description="Hardlink exported textures instead of copying when they are on the same drive as the project "
+                    "(the project file then changes whenever the source image is edited in place)",
+        default=False,
+    )
+    skip_unchanged: BoolProperty(
+        name="Skip Unchanged Prototypes",
+        description="Do not re-export prototypes whose mesh, materials and settings are unchanged since the last export",
+        default=True,
+    )
+    parallel_export: BoolProperty(
+        name="Parallel Export",
+        description="Export prototypes in background Blender processes (used when there are at least 4 prototypes to export)",
+        default=False,
+    )
+    parallel_workers: IntProperty(name="Workers", default=4, min=1, max=64)
 
     default_material: StringProperty(name="Default Material", default=BUILTIN_DEFAULT_DEFOLD_MATERIAL)
 
@@ -28,6 +28,15 @@ class REFORGE_PT_panel(bpy.types.Panel):
             col.separator()
             col.prop(s, "export_visible_only")
             col.prop(s, "export_textures")
+            sub = col.row(align=True)
+            sub.enabled = s.export_textures
+            sub.prop(s, "allow_hardlink_textures")
+            col.prop(s, "skip_unchanged")
+            row = col.row(align=True)
+            row.prop(s, "parallel_export")
+            sub = row.row(align=True)
+            sub.enabled = s.parallel_export
+            sub.prop(s, "parallel_workers")
             col.prop(s, "default_material")
             col.separator()
             col.operator("reforge.generate", icon="EXPORT")
@@ -109,6 +118,7 @@ class REFORGE_PT_material_props(bpy.types.Panel):
         sub.enabled = bool(mat.get("bake_color_texture"))
         sub.prop(mat, '["bake_resolution"]', text="Bake Resolution")
         sub.prop(mat, '["bake_padding"]', text="Bake Padding")
+        sub.prop(mat, '["force_solid_when_constant"]', text="Solid 1x1 PNG for Constant Color")
 
 _CLASSES = (REFORGE_PT_panel, REFORGE_PT_material_props)
 
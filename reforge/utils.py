@@ -1,46 +1,140 @@
 import os
+import posixpath
+import re
+import shutil
+from functools import lru_cache
+from itertools import compress
 import bpy
+import numpy as np
+
+# Dirs already created/verified during the current export run; reset by clear_dir_cache()
+_DIR_CACHE = set()
+
+def clear_dir_cache():
+    """Called at the start of each export run in export_core (dirs may have been removed since the last one)."""
+    _DIR_CACHE.clear()
 
 def ensure_dir(path: str):
+    if path in _DIR_CACHE:
+        return
     os.makedirs(path, exist_ok=True)
+    _DIR_CACHE.add(path)
 
 def safe_remove_file(path: str):
     try:
         if os.path.isfile(path):
             os.remove(path)
+    except FileNotFoundError:
+        pass  # already gone (e.g. removed by another export worker)
     except Exception as e:
         print(f"[Reforge][WARN] Can't remove file: {path} ({e})")
 
+def copy_file_fast(src: str, dst: str, allow_hardlink: bool = False):
+    """
+    Copy src -> dst keeping the source mtime. The copy is made under a temporary name
+    next to dst and renamed over it, so other processes (parallel export workers) never
+    see a half-written dst and a previous hardlink at dst is never written through.
+    With allow_hardlink, same-filesystem copies become hardlinks; shutil.copyfile already
+    uses sendfile/fcopyfile otherwise.
+    """
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        linked = False
+        if allow_hardlink:
+            try:
+                if os.stat(src).st_dev == os.stat(os.path.dirname(dst) or ".").st_dev:
+                    if os.path.lexists(tmp):
+                        os.remove(tmp)
+                    os.link(src, tmp)
+                    linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copyfile(src, tmp)
+            st = os.stat(src)
+            os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+
 def write_text_file(abs_path: str, text: str):
-    with open(abs_path, "w", encoding="utf-8", newline="\n") as f:
-        f.write(text)
+    # encode once and write raw bytes straight to the fd: no file object, "\n" kept as-is on every OS
+    data = memoryview(text.encode("utf-8"))
+    fd = os.open(abs_path, _WRITE_FLAGS, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+def project_path(*parts) -> str:
+    """Defold project path ("/dir/file"). Always forward slashes, whatever the OS."""
+    return "/" + posixpath.join(*parts)
+
+# Keep alphanumerics, "_" and "-": C-level translate for ASCII names, precompiled regex otherwise
+# (Unicode \w is exactly str.isalnum() plus "_")
+_ID_DELETE_ASCII = {cp: None for cp in range(0x80) if not (chr(cp).isalnum() or chr(cp) in "_-")}
+_ID_STRIP_RE = re.compile(r"[^\w\-]")
+
+@lru_cache(maxsize=8192)
+def sanitize_name(name: str) -> str:
+    """sanitize_id for a value that is already a str (object names): strip, spaces -> "_", filter."""
+    name = name.strip().replace(" ", "_")
+    name = name.translate(_ID_DELETE_ASCII) if name.isascii() else _ID_STRIP_RE.sub("", name)
+    return name or "prototype"
 
 def sanitize_id(s: str) -> str:
-    s = str(s).strip().replace(" ", "_")
-    s = "".join(ch for ch in s if ch.isalnum() or ch in "_-")
-    return s or "prototype"
+    # memoized: scenes repeat the same prototype/object base names many times
+    return sanitize_name(str(s))
 
 def select_only(obj):
-    bpy.ops.object.select_all(action='DESELECT')
+    # Deselect only what is selected; select_all(DESELECT) walks the whole scene through an operator
+    view_layer = bpy.context.view_layer
+    for o in list(view_layer.objects.selected):
+        o.select_set(False)
     obj.select_set(True)
-    bpy.context.view_layer.objects.active = obj
-
-def export_glb_selected(abs_path: str):
-    bpy.ops.export_scene.gltf(
-        filepath=abs_path,
-        export_format='GLB',
-        use_selection=True,
-        export_apply=True,
-        export_yup=True,
-        export_materials='EXPORT',
-        export_animations=False,
-    )
+    view_layer.objects.active = obj
+
+def export_glb_selected(abs_path: str, obj):
+    """
+    Export obj alone as GLB. The glTF add-on filters by Object.select_get() rather than the
+    context's selected_objects, so obj is still made the only selected object; the override
+    just gives the operator a matching context (and obj stays selected afterwards, as before).
+    """
+    select_only(obj)
+    with bpy.context.temp_override(active_object=obj, object=obj, selected_objects=[obj]):
+        bpy.ops.export_scene.gltf(
+            filepath=abs_path,
+            export_format='GLB',
+            use_selection=True,
+            export_apply=True,
+            export_yup=True,
+            export_materials='EXPORT',
+            export_animations=False,
+        )
+
+def id_props(idblock):
+    """
+    The ID-property group of idblock, for repeated get/set on one ID without
+    re-resolving the group per access. id_properties_ensure() exists since Blender 3.0;
+    older versions get the ID itself (same get/[]/in interface).
+    """
+    ensure = getattr(idblock, "id_properties_ensure", None)
+    return ensure() if ensure is not None else idblock
 
 def get_prop(obj, key):
+    # object first, then its data; obj.data is read once
     v = obj.get(key)
-    if v is None and getattr(obj, "data", None) is not None:
-        v = obj.data.get(key)
-    return v
+    if v is not None:
+        return v
+    data = getattr(obj, "data", None)
+    return None if data is None else data.get(key)
 
 def is_object_visible(obj, view_layer) -> bool:
     if obj.hide_get():
@@ -48,4 +142,18 @@ def is_object_visible(obj, view_layer) -> bool:
     try:
         return obj.visible_get(view_layer=view_layer)
     except TypeError:
-        return obj.visible_get()
\ No newline at end of file
+        return obj.visible_get()
+
+def visible_mask(objects, view_layer) -> np.ndarray:
+    """
+    Bool mask over objects (a bpy collection such as scene.objects): is_object_visible for each.
+    Objects disabled in viewports are dropped by one bulk foreach_get; per-view-layer state
+    (hide_get / visible_get) has no bulk accessor and is only queried for the rest.
+    """
+    mask = np.empty(len(objects), dtype=bool)
+    objects.foreach_get("hide_viewport", mask)
+    np.logical_not(mask, out=mask)
+    # walk the collection once (int indexing into scene.objects is not O(1))
+    for i, obj in zip(np.flatnonzero(mask).tolist(), compress(objects, mask.tolist())):
+        mask[i] = is_object_visible(obj, view_layer)
+    return mask